@@ -0,0 +1,29 @@
+"""add email_logs keyset pagination index
+
+Revision ID: 410243d627cb
+Revises: 7f0d9a2e1c1d
+Create Date: 2026-10-15 18:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "410243d627cb"
+down_revision = "7f0d9a2e1c1d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_email_logs_tenant_created",
+        "email_logs",
+        ["tenant_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_email_logs_tenant_created", table_name="email_logs")
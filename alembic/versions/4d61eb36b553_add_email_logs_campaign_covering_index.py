@@ -0,0 +1,30 @@
+"""add covering index for campaign email log listing
+
+Revision ID: 4d61eb36b553
+Revises: 410243d627cb
+Create Date: 2026-10-15 18:30:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "4d61eb36b553"
+down_revision = "410243d627cb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_email_logs_campaign_created",
+        "email_logs",
+        ["campaign_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["tenant_id", "subscriber_id", "recipient_email", "message_id", "status"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_email_logs_campaign_created", table_name="email_logs")
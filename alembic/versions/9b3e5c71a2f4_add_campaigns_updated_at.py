@@ -0,0 +1,27 @@
+"""add updated_at to campaigns
+
+Revision ID: 9b3e5c71a2f4
+Revises: 4d61eb36b553
+Create Date: 2026-10-15 19:10:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9b3e5c71a2f4"
+down_revision = "4d61eb36b553"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "campaigns",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("campaigns", "updated_at")
@@ -0,0 +1,43 @@
+"""lower-case stored email addresses
+
+Revision ID: a8d2f6c4e1b3
+Revises: f3c7a0b5d8e9
+Create Date: 2026-10-15 21:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8d2f6c4e1b3"
+down_revision = "f3c7a0b5d8e9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE email_logs SET recipient_email = lower(recipient_email) WHERE recipient_email <> lower(recipient_email)")
+    # Lower-case one row per (tenant, address): the lowest id among mixed-case variants, and only when
+    # no lower-case row exists yet. The other variants are left as they are rather than tripping the
+    # unique index (their ids may still be referenced by email_logs).
+    for table in ("subscribers", "suppressed_emails"):
+        op.execute(
+            f"""
+            UPDATE {table} AS t SET email = lower(t.email)
+            FROM (
+                SELECT id, row_number() OVER (PARTITION BY tenant_id, lower(email) ORDER BY id) AS rn
+                FROM {table}
+                WHERE email <> lower(email)
+            ) AS ranked
+            WHERE t.id = ranked.id
+              AND ranked.rn = 1
+              AND NOT EXISTS (
+                SELECT 1 FROM {table} AS o WHERE o.tenant_id = t.tenant_id AND o.email = lower(t.email)
+              )
+            """
+        )
+
+
+def downgrade():
+    # Original casing is not recoverable; lower-cased addresses remain valid.
+    pass
@@ -0,0 +1,47 @@
+"""make the email_logs message_id index partial and drop the redundant suppressed_emails email index
+
+Revision ID: b7e3d1f9a4c2
+Revises: a8d2f6c4e1b3
+Create Date: 2026-10-15 22:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b7e3d1f9a4c2"
+down_revision = "a8d2f6c4e1b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction; it keeps email_logs writable during the build.
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_email_logs_message_id", table_name="email_logs", postgresql_concurrently=True)
+        op.create_index(
+            "ix_email_logs_message_id",
+            "email_logs",
+            ["message_id"],
+            unique=False,
+            postgresql_where=sa.text("message_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        # Covered by ix_suppressed_emails_tenant_email.
+        op.drop_index("ix_suppressed_emails_email", table_name="suppressed_emails", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_suppressed_emails_email",
+            "suppressed_emails",
+            ["email"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_email_logs_message_id", table_name="email_logs", postgresql_concurrently=True)
+        op.create_index(
+            "ix_email_logs_message_id", "email_logs", ["message_id"], unique=False, postgresql_concurrently=True
+        )
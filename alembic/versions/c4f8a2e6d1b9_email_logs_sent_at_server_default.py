@@ -0,0 +1,37 @@
+"""default email_logs.sent_at on the server
+
+Revision ID: c4f8a2e6d1b9
+Revises: b7e3d1f9a4c2
+Create Date: 2026-10-15 23:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c4f8a2e6d1b9"
+down_revision = "b7e3d1f9a4c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE email_logs SET sent_at = COALESCE(created_at, now()) WHERE sent_at IS NULL")
+    op.alter_column(
+        "email_logs",
+        "sent_at",
+        existing_type=sa.DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=False,
+    )
+
+
+def downgrade():
+    op.alter_column(
+        "email_logs",
+        "sent_at",
+        existing_type=sa.DateTime(timezone=True),
+        server_default=None,
+        nullable=True,
+    )
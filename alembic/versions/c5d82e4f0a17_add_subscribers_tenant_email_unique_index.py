@@ -0,0 +1,23 @@
+"""add unique subscribers (tenant_id, email) index
+
+Revision ID: c5d82e4f0a17
+Revises: 9b3e5c71a2f4
+Create Date: 2026-10-15 19:40:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5d82e4f0a17"
+down_revision = "9b3e5c71a2f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_subscribers_tenant_email", "subscribers", ["tenant_id", "email"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_subscribers_tenant_email", table_name="subscribers")
@@ -0,0 +1,54 @@
+"""add unique email_events SNS message indexes
+
+Revision ID: c8a2f4e6b0d3
+Revises: e7c1a9d4b2f6
+Create Date: 2026-10-15 23:55:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c8a2f4e6b0d3"
+down_revision = "e7c1a9d4b2f6"
+branch_labels = None
+depends_on = None
+
+# Keep the first event recorded per (topic, SNS message, log) so the unique indexes can be built.
+_DELETE_DUPLICATE_EVENTS = sa.text(
+    "DELETE FROM email_events WHERE topic_arn IS NOT NULL AND sns_message_id IS NOT NULL "
+    "AND id NOT IN (SELECT MIN(id) FROM email_events WHERE topic_arn IS NOT NULL "
+    "AND sns_message_id IS NOT NULL GROUP BY topic_arn, sns_message_id, email_log_id)"
+)
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(_DELETE_DUPLICATE_EVENTS)
+        op.create_index(
+            "ix_email_events_sns_message_log",
+            "email_events",
+            ["topic_arn", "sns_message_id", "email_log_id"],
+            unique=True,
+            postgresql_where=sa.text("email_log_id IS NOT NULL"),
+            sqlite_where=sa.text("email_log_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_email_events_sns_message_unmatched",
+            "email_events",
+            ["topic_arn", "sns_message_id"],
+            unique=True,
+            postgresql_where=sa.text("email_log_id IS NULL"),
+            sqlite_where=sa.text("email_log_id IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_email_events_sns_message_unmatched", table_name="email_events", postgresql_concurrently=True
+        )
+        op.drop_index("ix_email_events_sns_message_log", table_name="email_events", postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""add subscribers (tenant_id, status, id) index
+
+Revision ID: d2b6e8f1c3a5
+Revises: c4f8a2e6d1b9
+Create Date: 2026-10-15 23:30:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2b6e8f1c3a5"
+down_revision = "c4f8a2e6d1b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves campaign recipient scans, which filter on tenant and status and page through ids in order.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_subscribers_tenant_status_id",
+            "subscribers",
+            ["tenant_id", "status", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_subscribers_tenant_status_id", table_name="subscribers", postgresql_concurrently=True)
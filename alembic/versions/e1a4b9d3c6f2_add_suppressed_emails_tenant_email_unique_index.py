@@ -0,0 +1,25 @@
+"""add unique suppressed_emails (tenant_id, email) index
+
+Revision ID: e1a4b9d3c6f2
+Revises: c5d82e4f0a17
+Create Date: 2026-10-15 20:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1a4b9d3c6f2"
+down_revision = "c5d82e4f0a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_suppressed_emails_tenant_email", "suppressed_emails", ["tenant_id", "email"], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_suppressed_emails_tenant_email", table_name="suppressed_emails")
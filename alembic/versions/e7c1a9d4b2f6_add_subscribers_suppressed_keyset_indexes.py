@@ -0,0 +1,39 @@
+"""add subscribers / suppressed_emails keyset pagination indexes
+
+Revision ID: e7c1a9d4b2f6
+Revises: d2b6e8f1c3a5
+Create Date: 2026-10-15 23:45:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e7c1a9d4b2f6"
+down_revision = "d2b6e8f1c3a5"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_subscribers_tenant_created", "subscribers"),
+    ("ix_suppressed_emails_tenant_created", "suppressed_emails"),
+)
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table in _INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["tenant_id", sa.text("created_at DESC"), sa.text("id DESC")],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table in _INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,54 @@
+"""store email_events.payload_json as JSONB
+
+Revision ID: f3c7a0b5d8e9
+Revises: e1a4b9d3c6f2
+Create Date: 2026-10-15 20:30:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "f3c7a0b5d8e9"
+down_revision = "e1a4b9d3c6f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Payloads over the old 32 KB limit were cut mid-document and are not valid JSON; keep those
+    # as JSON strings instead of letting one row abort the cast.
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.payload_to_jsonb(value text) RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN invalid_text_representation OR untranslatable_character THEN
+            RETURN to_jsonb(value);
+        END
+        $$
+        """
+    )
+    op.alter_column(
+        "email_events",
+        "payload_json",
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="pg_temp.payload_to_jsonb(payload_json)",
+    )
+    op.execute("DROP FUNCTION pg_temp.payload_to_jsonb(text)")
+
+
+def downgrade():
+    op.alter_column(
+        "email_events",
+        "payload_json",
+        existing_type=postgresql.JSONB(),
+        type_=sa.Text(),
+        existing_nullable=False,
+        postgresql_using="payload_json::text",
+    )
@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.api.routes import admin_tools, campaigns, domains, email_logs, events, send, subscribers, tenants, suppression
 from src.core.config import settings
@@ -12,6 +13,11 @@ from src.db import models
 from src.db.session import engine
 from src.utils.logger import configure_logging, logger
 
+__all__ = ["app"]
+
+
+_ALLOWED_ORIGINS = tuple(settings.allowed_origins)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover - startup hook
@@ -22,8 +28,10 @@ async def lifespan(app: FastAPI):  # pragma: no cover - startup hook
         logger.warning(
             "No AWS credentials detected for local development. SES calls will fail unless credentials are provided via .env or AWS CLI."
         )
-    # Ensure tables exist for local development. Alembic should manage in production.
-    models.Base.metadata.create_all(bind=engine)
+    # Ensure tables exist for local development. Alembic owns the schema everywhere else,
+    # so skip the per-table existence checks on every worker boot.
+    if settings.environment == "development":
+        models.Base.metadata.create_all(bind=engine)
     yield
 
 
@@ -31,16 +39,18 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.api_version,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.allowed_origins,
+    allow_origins=_ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Starlette matches routes in registration order, so the hottest routers go first.
 app.include_router(send.router)
 app.include_router(campaigns.router)
 app.include_router(subscribers.router)
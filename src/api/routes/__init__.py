@@ -1 +1,13 @@
 """Route modules exposed by the API."""
+
+__all__ = [
+    "admin_tools",
+    "campaigns",
+    "domains",
+    "email_logs",
+    "events",
+    "send",
+    "subscribers",
+    "suppression",
+    "tenants",
+]
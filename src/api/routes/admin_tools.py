@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from src.api.routes.campaigns import campaign_cache
 from src.queue.campaign_runner import enqueue_campaign_run, run_campaign
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -13,6 +14,7 @@ def run_campaign_now(campaign_id: int) -> dict[str, int]:
     """Manually execute a campaign synchronously."""
 
     enqueued = run_campaign(campaign_id)
+    campaign_cache.pop(campaign_id)
     return {"enqueued": enqueued}
 
 
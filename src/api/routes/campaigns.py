@@ -1,17 +1,59 @@
 """Campaign management endpoints."""
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.pagination import keyset_page, split_page
+from src.core.cache import ResponseCache
 from src.db import models
-from src.db.session import get_db
+from src.db.session import get_async_db
 from src.queue.campaign_runner import enqueue_campaign_run, run_campaign
+from src.services.ses import campaign_content_digest, ses_service
 
 router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+# Serves get/preview polling without touching the DB; invalidated by API writes. Status changes made
+# by RQ campaign jobs run in another process, so those show up once the entry expires.
+campaign_cache = ResponseCache(maxsize=10_000, ttl=30)
+
+# Columns backing CampaignResponse; selected/returned directly to skip ORM hydration.
+_CAMPAIGN_COLS = (
+    models.Campaign.id,
+    models.Campaign.tenant_id,
+    models.Campaign.name,
+    models.Campaign.subject,
+    models.Campaign.body,
+    models.Campaign.status,
+    models.Campaign.updated_at,
+)
+_CAMPAIGN_BY_ID = (
+    select(models.Campaign)
+    .where(models.Campaign.id == bindparam("campaign_id"))
+    .execution_options(raiseload_strict=True)
+)
+_UPDATE_CAMPAIGN = (
+    update(models.Campaign)
+    .where(models.Campaign.id == bindparam("campaign_id"))
+    .returning(*_CAMPAIGN_COLS)
+    .execution_options(synchronize_session=False)
+)
+_DETACH_CAMPAIGN_LOGS = (
+    update(models.EmailLog)
+    .where(models.EmailLog.campaign_id == bindparam("detached_id"))
+    .values(campaign_id=None)
+    .execution_options(synchronize_session=False)
+)
+_DELETE_CAMPAIGN = (
+    delete(models.Campaign)
+    .where(models.Campaign.id == bindparam("campaign_id"))
+    .returning(models.Campaign.id)
+    .execution_options(synchronize_session=False)
+)
 
 
 class CampaignCreate(BaseModel):
@@ -35,9 +77,14 @@ class CampaignResponse(BaseModel):
     subject: str
     body: str
     status: str
+    updated_at: datetime | None = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CampaignPage(BaseModel):
+    items: list[CampaignResponse]
+    next_cursor: str | None = None
 
 
 class CampaignSchedule(BaseModel):
@@ -54,129 +101,171 @@ class CampaignSendResponse(BaseModel):
     status: str
 
 
+async def _get_campaign(db: AsyncSession, campaign_id: int) -> models.Campaign:
+    campaign = (await db.execute(_CAMPAIGN_BY_ID, {"campaign_id": campaign_id})).scalar_one_or_none()
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return campaign
+
+
+async def _cached_campaign(db: AsyncSession, campaign_id: int) -> CampaignResponse:
+    cached = campaign_cache.get(campaign_id)
+    if cached is None:
+        cached = CampaignResponse.model_validate(await _get_campaign(db, campaign_id))
+        campaign_cache.set(campaign_id, cached)
+    return cached
+
+
+async def _update_campaign_row(db: AsyncSession, campaign_id: int, **values) -> CampaignResponse:
+    """Apply `values` with a single UPDATE ... RETURNING and commit."""
+
+    result = await db.execute(_UPDATE_CAMPAIGN.values(**values), {"campaign_id": campaign_id})
+    row = result.mappings().first()
+    if row is None:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    await db.commit()
+    campaign_cache.pop(campaign_id)
+    return CampaignResponse(**row)
+
+
 @router.post("/", response_model=CampaignResponse)
-def create_campaign(payload: CampaignCreate, db: Session = Depends(get_db)) -> CampaignResponse:
+async def create_campaign(payload: CampaignCreate, db: AsyncSession = Depends(get_async_db)) -> CampaignResponse:
     """Create a campaign draft for a tenant."""
 
-    campaign = models.Campaign(
-        tenant_id=payload.tenant_id,
-        name=payload.name,
-        subject=payload.subject,
-        body=payload.body,
+    result = await db.execute(insert(models.Campaign).returning(*_CAMPAIGN_COLS), payload.model_dump())
+    row = result.mappings().one()
+    await db.commit()
+    return CampaignResponse(**row)
+
+
+@router.post("/bulk", response_model=list[CampaignResponse])
+async def create_campaigns_bulk(payload: list[CampaignCreate], db: AsyncSession = Depends(get_async_db)) -> list[CampaignResponse]:
+    """Create several campaign drafts with a single multi-row INSERT."""
+
+    if not payload:
+        return []
+    result = await db.execute(
+        insert(models.Campaign).returning(*_CAMPAIGN_COLS, sort_by_parameter_order=True),
+        [item.model_dump() for item in payload],
     )
-    db.add(campaign)
-    db.commit()
-    db.refresh(campaign)
-    return CampaignResponse.from_orm(campaign)
+    rows = result.mappings().all()
+    await db.commit()
+    return [CampaignResponse(**row) for row in rows]
 
 
-@router.get("/", response_model=list[CampaignResponse])
-def list_campaigns(
+@router.get("/", response_model=CampaignPage)
+async def list_campaigns(
     tenant_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
-) -> list[CampaignResponse]:
-    """List campaigns, optionally filtered by tenant."""
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> CampaignPage:
+    """List campaigns newest first, optionally filtered by tenant."""
 
-    query = db.query(models.Campaign)
+    stmt = select(*_CAMPAIGN_COLS, models.Campaign.created_at)
     if tenant_id is not None:
-        query = query.filter(models.Campaign.tenant_id == tenant_id)
-    campaigns = query.order_by(models.Campaign.created_at.desc()).all()
-    return [CampaignResponse.from_orm(c) for c in campaigns]
+        stmt = stmt.where(models.Campaign.tenant_id == tenant_id)
+    stmt = keyset_page(stmt, models.Campaign.created_at, models.Campaign.id, cursor=cursor, limit=limit)
+    result = await db.execute(stmt)
+    rows, next_cursor = split_page(result.mappings().all(), limit)
+    return CampaignPage(
+        items=[CampaignResponse.model_construct(**row) for row in rows],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)) -> CampaignResponse:
-    """Fetch a single campaign."""
+async def get_campaign(
+    campaign_id: int, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> CampaignResponse:
+    """Fetch a single campaign; may be up to ``campaign_cache.ttl`` seconds stale (see Cache-Control)."""
 
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    return CampaignResponse.from_orm(campaign)
+    response.headers["Cache-Control"] = campaign_cache.cache_control
+    return await _cached_campaign(db, campaign_id)
 
 
 @router.patch("/{campaign_id}", response_model=CampaignResponse)
-def update_campaign(
+async def update_campaign(
     campaign_id: int,
     payload: CampaignUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> CampaignResponse:
     """Update campaign fields."""
 
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-
-    if payload.name is not None:
-        campaign.name = payload.name
-    if payload.subject is not None:
-        campaign.subject = payload.subject
-    if payload.body is not None:
-        campaign.body = payload.body
-    if payload.status is not None:
-        campaign.status = payload.status
-
-    db.add(campaign)
-    db.commit()
-    db.refresh(campaign)
-    return CampaignResponse.from_orm(campaign)
+    # Only the submitted columns end up in the UPDATE; None still means "leave unchanged".
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    if not changes:
+        return await _cached_campaign(db, campaign_id)
+    return await _update_campaign_row(db, campaign_id, **changes)
 
 
 @router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
-def delete_campaign(campaign_id: int, db: Session = Depends(get_db)) -> Response:
-    """Delete a campaign."""
-
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
+async def delete_campaign(
+    campaign_id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """Delete a campaign and, after responding, its SES templates."""
+
+    # Mirror the ORM's delete behaviour of detaching the campaign's email logs.
+    await db.execute(_DETACH_CAMPAIGN_LOGS, {"detached_id": campaign_id})
+    deleted = (await db.execute(_DELETE_CAMPAIGN, {"campaign_id": campaign_id})).first()
+    if deleted is None:
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    db.delete(campaign)
-    db.commit()
+    await db.commit()
+    campaign_cache.pop(campaign_id)
+    background_tasks.add_task(ses_service.delete_campaign_templates, campaign_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/{campaign_id}/send-now", response_model=CampaignSendResponse)
-def send_campaign_now(campaign_id: int) -> CampaignSendResponse:
+async def send_campaign_now(campaign_id: int) -> CampaignSendResponse:
     """Execute a campaign immediately."""
 
-    enqueued = run_campaign(campaign_id)
+    # run_campaign uses its own blocking session; keep it off the event loop.
+    enqueued = await asyncio.to_thread(run_campaign, campaign_id)
+    campaign_cache.pop(campaign_id)
     return CampaignSendResponse(enqueued=enqueued, status="completed")
 
 
 @router.post("/{campaign_id}/schedule", response_model=CampaignResponse)
-def schedule_campaign(campaign_id: int, payload: CampaignSchedule, db: Session = Depends(get_db)) -> CampaignResponse:
+async def schedule_campaign(campaign_id: int, payload: CampaignSchedule, db: AsyncSession = Depends(get_async_db)) -> CampaignResponse:
     """Set a scheduled send time for a campaign."""
 
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    campaign.scheduled_at = payload.scheduled_at
-    campaign.status = "scheduled"
-    db.add(campaign)
-    db.commit()
-    db.refresh(campaign)
-    return CampaignResponse.from_orm(campaign)
+    return await _update_campaign_row(db, campaign_id, scheduled_at=payload.scheduled_at, status="scheduled")
 
 
 @router.post("/{campaign_id}/cancel-schedule", response_model=CampaignResponse)
-def cancel_campaign_schedule(campaign_id: int, db: Session = Depends(get_db)) -> CampaignResponse:
+async def cancel_campaign_schedule(campaign_id: int, db: AsyncSession = Depends(get_async_db)) -> CampaignResponse:
     """Cancel a scheduled campaign."""
 
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    campaign.scheduled_at = None
-    campaign.status = "draft"
-    db.add(campaign)
-    db.commit()
-    db.refresh(campaign)
-    return CampaignResponse.from_orm(campaign)
+    return await _update_campaign_row(db, campaign_id, scheduled_at=None, status="draft")
 
 
-@router.get("/{campaign_id}/preview", response_model=CampaignPreview)
-def preview_campaign(campaign_id: int, db: Session = Depends(get_db)) -> CampaignPreview:
-    """Return a preview of the campaign content."""
+def _campaign_etag(campaign: CampaignResponse) -> str:
+    # updated_at alone can repeat within a second on SQLite; the content digest tells those edits apart.
+    version = int(campaign.updated_at.timestamp() * 1_000_000) if campaign.updated_at else 0
+    return f'W/"{version}-{campaign_content_digest(campaign.subject, campaign.body)}"'
 
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
-    if campaign is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+
+@router.get("/{campaign_id}/preview", response_model=CampaignPreview)
+async def preview_campaign(
+    campaign_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> CampaignPreview | Response:
+    """Return a preview of the campaign content, or 304 if the client's copy is current."""
+
+    campaign = await _cached_campaign(db, campaign_id)
+    etag = _campaign_etag(campaign)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": campaign_cache.cache_control},
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = campaign_cache.cache_control
     return CampaignPreview(subject=campaign.subject, body=campaign.body)
 
@@ -1,23 +1,53 @@
 """Domain verification endpoints."""
 from __future__ import annotations
 
-import secrets
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, field_validator
+import os
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, field_validator
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 
+from src.core.cache import ResponseCache
 from src.db import models
 from src.db.session import get_db
 
 router = APIRouter(prefix="/domains", tags=["domains"])
 
+# Verification tokens are carved from a pooled urandom buffer: one getrandom call per 256 tokens.
+_TOKEN_BYTES = 16
+_TOKEN_POOL = bytearray()
+_TOKEN_POOL_LOCK = threading.Lock()
+# Forked workers must never hand out bytes inherited from the parent's pool.
+os.register_at_fork(after_in_child=_TOKEN_POOL.clear)
+
+# Verification status is polled by UIs but only changes through mark_domain_verified or a tenant
+# delete; both invalidate it, though other API processes keep their copy until it expires.
+domain_status_cache = ResponseCache(maxsize=10_000, ttl=30)
+
+_SES_RECORD_NAME_TMPL = "_amazonses.%s"
+_SES_CNAME_VALUE_TMPL = "%s.amazonaws.com"
+
+_TENANT_BY_ID = (
+    select(models.Tenant)
+    .where(models.Tenant.id == bindparam("tenant_id"))
+    .execution_options(raiseload_strict=True)
+)
+_MARK_TENANT_VERIFIED = (
+    update(models.Tenant)
+    .where(models.Tenant.id == bindparam("tenant_id"))
+    .values(ses_verified=True)
+    .returning(models.Tenant.id, models.Tenant.ses_verified)
+    .execution_options(synchronize_session=False)
+)
+
 
 class DomainStatusResponse(BaseModel):
     tenant_id: int
     ses_verified: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DomainVerificationRequest(BaseModel):
@@ -44,36 +74,52 @@ class MarkVerifiedRequest(BaseModel):
     tenant_id: int
 
 
-@router.get("/status", response_model=DomainStatusResponse)
-def get_domain_status(tenant_id: int, db: Session = Depends(get_db)) -> DomainStatusResponse:
-    """Return SES verification status for a tenant."""
+def _token_hex() -> str:
+    with _TOKEN_POOL_LOCK:
+        if len(_TOKEN_POOL) < _TOKEN_BYTES:
+            _TOKEN_POOL.extend(os.urandom(_TOKEN_BYTES * 256))
+        token = bytes(_TOKEN_POOL[:_TOKEN_BYTES])
+        del _TOKEN_POOL[:_TOKEN_BYTES]
+    return token.hex()
 
-    tenant = db.query(models.Tenant).filter(models.Tenant.id == tenant_id).first()
+
+def _get_tenant(db: Session, tenant_id: int) -> models.Tenant:
+    tenant = db.execute(_TENANT_BY_ID, {"tenant_id": tenant_id}).scalar_one_or_none()
     if tenant is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
-    return DomainStatusResponse(tenant_id=tenant.id, ses_verified=tenant.ses_verified)
+    return tenant
+
+
+@router.get("/status", response_model=DomainStatusResponse)
+def get_domain_status(tenant_id: int, response: Response, db: Session = Depends(get_db)) -> DomainStatusResponse:
+    """Return SES verification status for a tenant; may be up to ``domain_status_cache.ttl`` seconds stale."""
+
+    response.headers["Cache-Control"] = domain_status_cache.cache_control
+    cached = domain_status_cache.get(tenant_id)
+    if cached is not None:
+        return cached
+    tenant = _get_tenant(db, tenant_id)
+    response = DomainStatusResponse(tenant_id=tenant.id, ses_verified=tenant.ses_verified)
+    domain_status_cache.set(tenant_id, response)
+    return response
 
 
 @router.post("/request-verification", response_model=DomainVerificationResponse)
 def request_domain_verification(payload: DomainVerificationRequest, db: Session = Depends(get_db)) -> DomainVerificationResponse:
     """Generate SES DNS records for domain verification."""
 
-    tenant = db.query(models.Tenant).filter(models.Tenant.id == payload.tenant_id).first()
-    if tenant is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
+    _get_tenant(db, payload.tenant_id)
 
-    token = secrets.token_hex(16)
-    txt_name = f"_amazonses.{payload.domain}"
-    txt_value = token
-    cname_name = f"_amazonses.{payload.domain}"
-    cname_value = f"{token}.amazonaws.com"
+    token = _token_hex()
+    record_name = _SES_RECORD_NAME_TMPL % payload.domain
 
-    return DomainVerificationResponse(
+    # Every field is a str built here, so skip re-validating them.
+    return DomainVerificationResponse.model_construct(
         domain=payload.domain,
-        txt_name=txt_name,
-        txt_value=txt_value,
-        cname_name=cname_name,
-        cname_value=cname_value,
+        txt_name=record_name,
+        txt_value=token,
+        cname_name=record_name,
+        cname_value=_SES_CNAME_VALUE_TMPL % token,
     )
 
 
@@ -81,12 +127,10 @@ def request_domain_verification(payload: DomainVerificationRequest, db: Session
 def mark_domain_verified(payload: MarkVerifiedRequest, db: Session = Depends(get_db)) -> DomainStatusResponse:
     """Mark a tenant's SES configuration as verified."""
 
-    tenant = db.query(models.Tenant).filter(models.Tenant.id == payload.tenant_id).first()
-    if tenant is None:
+    row = db.execute(_MARK_TENANT_VERIFIED, {"tenant_id": payload.tenant_id}).first()
+    if row is None:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
-
-    tenant.ses_verified = True
-    db.add(tenant)
     db.commit()
-    db.refresh(tenant)
-    return DomainStatusResponse(tenant_id=tenant.id, ses_verified=tenant.ses_verified)
+    domain_status_cache.pop(payload.tenant_id)
+    return DomainStatusResponse(tenant_id=row.id, ses_verified=row.ses_verified)
@@ -2,14 +2,32 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
+from src.api.pagination import keyset_page, split_page
 from src.db import models
 from src.db.session import get_db
 
 router = APIRouter(prefix="/email-logs", tags=["email-logs"])
 
+# Columns backing EmailLogResponse; list endpoints select these directly to skip ORM hydration.
+_LOG_COLS = (
+    models.EmailLog.id,
+    models.EmailLog.tenant_id,
+    models.EmailLog.campaign_id,
+    models.EmailLog.subscriber_id,
+    models.EmailLog.recipient_email,
+    models.EmailLog.message_id,
+    models.EmailLog.status,
+)
+_LOG_BY_ID = (
+    select(models.EmailLog)
+    .where(models.EmailLog.id == bindparam("log_id"))
+    .execution_options(raiseload_strict=True)
+)
+
 
 class EmailLogResponse(BaseModel):
     id: int
@@ -20,39 +38,51 @@ class EmailLogResponse(BaseModel):
     message_id: str | None = None
     status: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EmailLogPage(BaseModel):
+    items: list[EmailLogResponse]
+    next_cursor: str | None = None
 
 
 def _get_log(db: Session, log_id: int) -> models.EmailLog:
-    log = db.query(models.EmailLog).filter(models.EmailLog.id == log_id).first()
+    log = db.execute(_LOG_BY_ID, {"log_id": log_id}).scalar_one_or_none()
     if log is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email log not found")
     return log
 
 
-@router.get("/", response_model=list[EmailLogResponse])
-def list_logs(tenant_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[EmailLogResponse]:
-    """List email logs optionally filtered by tenant."""
+@router.get("/", response_model=EmailLogPage)
+def list_logs(
+    tenant_id: int | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> EmailLogPage:
+    """List email logs newest first, optionally filtered by tenant."""
 
-    query = db.query(models.EmailLog)
+    stmt = select(*_LOG_COLS, models.EmailLog.created_at)
     if tenant_id is not None:
-        query = query.filter(models.EmailLog.tenant_id == tenant_id)
-    logs = query.order_by(models.EmailLog.created_at.desc()).all()
-    return [EmailLogResponse.from_orm(log) for log in logs]
+        stmt = stmt.where(models.EmailLog.tenant_id == tenant_id)
+    stmt = keyset_page(stmt, models.EmailLog.created_at, models.EmailLog.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(db.execute(stmt).mappings().all(), limit)
+    return EmailLogPage(items=[EmailLogResponse.model_construct(**row) for row in rows], next_cursor=next_cursor)
 
 
-@router.get("/campaign/{campaign_id}", response_model=list[EmailLogResponse])
-def list_campaign_logs(campaign_id: int, db: Session = Depends(get_db)) -> list[EmailLogResponse]:
-    """List email logs for a campaign."""
+@router.get("/campaign/{campaign_id}", response_model=EmailLogPage)
+def list_campaign_logs(
+    campaign_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> EmailLogPage:
+    """List email logs for a campaign newest first."""
 
-    logs = (
-        db.query(models.EmailLog)
-        .filter(models.EmailLog.campaign_id == campaign_id)
-        .order_by(models.EmailLog.created_at.desc())
-        .all()
-    )
-    return [EmailLogResponse.from_orm(log) for log in logs]
+    stmt = select(*_LOG_COLS, models.EmailLog.created_at).where(models.EmailLog.campaign_id == campaign_id)
+    stmt = keyset_page(stmt, models.EmailLog.created_at, models.EmailLog.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(db.execute(stmt).mappings().all(), limit)
+    return EmailLogPage(items=[EmailLogResponse.model_construct(**row) for row in rows], next_cursor=next_cursor)
 
 
 @router.get("/{log_id}", response_model=EmailLogResponse)
@@ -60,4 +90,4 @@ def get_log(log_id: int, db: Session = Depends(get_db)) -> EmailLogResponse:
     """Get details of a single email log."""
 
     log = _get_log(db, log_id)
-    return EmailLogResponse.from_orm(log)
+    return EmailLogResponse.model_validate(log)
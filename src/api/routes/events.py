@@ -1,33 +1,116 @@
 """Inbound webhook handlers for SES/SNS notifications."""
 from __future__ import annotations
 
-import json
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import models
-from src.db.session import get_db
+from src.db.session import get_async_db
+from src.db.upsert import insert_ignore_conflicts
 from src.core.config import settings
-from src.utils.sns import confirm_subscription, dumps_payload, verify_sns_signature
+from src.utils.datetime import utcnow_batch
+from src.utils.sns import confirm_subscription, verify_sns_signature
 from src.utils.logger import logger
 
+try:  # pragma: no cover - optional dependency import
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads
+
+try:  # pragma: no cover - optional dependency import
+    import redis.asyncio as aioredis  # type: ignore
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore
+
 router = APIRouter(prefix="/events", tags=["events"])
 
+# SNS redelivers aggressively; remember message ids for a day in Redis before touching the DB.
+_SNS_DEDUP_TTL_SECONDS = 24 * 60 * 60
+_SNS_DEDUP_REDIS_TIMEOUT = 0.5
+_dedup_redis: Any | None = None
+
+# Built once at import: every SNS notification runs these, so skip per-request statement construction.
+_EVENT_SEEN = (
+    select(models.EmailEvent.id)
+    .where(
+        models.EmailEvent.sns_message_id == bindparam("sns_message_id"),
+        models.EmailEvent.topic_arn == bindparam("topic_arn"),
+    )
+    .limit(1)
+)
+_LOGS_BY_MESSAGE_ID = (
+    select(models.EmailLog)
+    .where(models.EmailLog.message_id == bindparam("ses_message_id"))
+    .execution_options(raiseload_strict=True)
+)
+_LOGS_BY_MESSAGE_ID_AND_RECIPIENT = _LOGS_BY_MESSAGE_ID.where(
+    models.EmailLog.recipient_email.in_(bindparam("recipients", expanding=True))
+)
+
 
 def _parse_timestamp(value: str | None) -> datetime | None:
     if not value:
         return None
-    if value.endswith("Z"):
-        value = value.replace("Z", "+00:00")
+    return _parse_timestamp_cached(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp_cached(value: str) -> datetime | None:
+    # SNS batches repeat the same timestamp; fromisoformat accepts the trailing "Z" on 3.11+.
     try:
         return datetime.fromisoformat(value)
     except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_dedup_redis() -> Any:
+    global _dedup_redis
+    if _dedup_redis is None:
+        if aioredis is None:
+            return None
+        _dedup_redis = aioredis.Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=_SNS_DEDUP_REDIS_TIMEOUT,
+            socket_timeout=_SNS_DEDUP_REDIS_TIMEOUT,
+        )
+    return _dedup_redis
+
+
+async def _claim_sns_message(key: str) -> bool | None:
+    """Mark an SNS message as seen; False if it already was, None if Redis is unavailable.
+
+    A successful claim replaces the email_events lookup in `_persist_events`, which only runs
+    as the fallback when Redis is down.
+    """
+    client = _get_dedup_redis()
+    if client is None:
+        return None
+    try:
+        return bool(await client.set(key, "1", nx=True, ex=_SNS_DEDUP_TTL_SECONDS))
+    except Exception as exc:
+        logger.warning("SNS dedup check unavailable, falling back to the database: %s", exc)
         return None
 
 
+async def _release_sns_message(key: str) -> None:
+    try:
+        await _get_dedup_redis().delete(key)
+    except Exception as exc:
+        logger.warning("Failed to release SNS dedup key %s: %s", key, exc)
+
+
 def _update_logs(
-    db: Session,
+    db: AsyncSession,
     logs: list[models.EmailLog],
     *,
     status_value: str,
@@ -39,12 +122,13 @@ def _update_logs(
     complaint_type: str | None,
     ses_message_id: str | None,
 ) -> None:
+    last_event_at = event_time or utcnow_batch()
     for log in logs:
         if ses_message_id and not log.message_id:
             log.message_id = ses_message_id
         log.status = status_value
         log.last_event_type = event_type
-        log.last_event_at = event_time or datetime.now(timezone.utc)
+        log.last_event_at = last_event_at
         log.last_smtp_response = smtp_response
         log.bounce_type = bounce_type
         log.bounce_subtype = bounce_subtype
@@ -52,64 +136,89 @@ def _update_logs(
         db.add(log)
 
 
-def _persist_event(
-    db: Session,
+async def _persist_events(
+    db: AsyncSession,
     *,
-    email_log_id: int | None,
+    email_log_ids: list[int | None],
     ses_message_id: str | None,
     sns_message_id: str | None,
     event_type: str,
     topic_arn: str | None,
     signature_verified: bool,
     payload: dict,
+    claimed: bool | None,
 ) -> None:
-    if sns_message_id and topic_arn:
-        exists = (
-            db.query(models.EmailEvent)
-            .filter(models.EmailEvent.sns_message_id == sns_message_id, models.EmailEvent.topic_arn == topic_arn)
-            .first()
-        )
+    """Record one EmailEvent per matched log in a single INSERT, unless this SNS message was seen before.
+
+    ``claimed`` is the Redis dedup result; the database lookup only runs when Redis was unavailable.
+    Either way the unique (topic_arn, sns_message_id, email_log_id) indexes skip rows already recorded.
+    """
+    if claimed is None and sns_message_id and topic_arn:
+        exists = await db.scalar(_EVENT_SEEN, {"sns_message_id": sns_message_id, "topic_arn": topic_arn})
         if exists:
             return
-    event = models.EmailEvent(
-        email_log_id=email_log_id,
-        ses_message_id=ses_message_id,
-        sns_message_id=sns_message_id,
-        event_type=event_type,
-        topic_arn=topic_arn,
-        payload_json=dumps_payload(payload),
-        signature_verified=signature_verified,
+    if email_log_ids == [None]:
+        stmt = insert_ignore_conflicts(
+            db, models.EmailEvent, ["topic_arn", "sns_message_id"], models.EmailEvent.email_log_id.is_(None)
+        )
+    else:
+        stmt = insert_ignore_conflicts(
+            db,
+            models.EmailEvent,
+            ["topic_arn", "sns_message_id", "email_log_id"],
+            models.EmailEvent.email_log_id.isnot(None),
+        )
+    await db.execute(
+        stmt,
+        [
+            {
+                "email_log_id": email_log_id,
+                "ses_message_id": ses_message_id,
+                "sns_message_id": sns_message_id,
+                "event_type": event_type,
+                "topic_arn": topic_arn,
+                "payload_json": payload,
+                "signature_verified": signature_verified,
+            }
+            for email_log_id in email_log_ids
+        ],
     )
-    db.add(event)
 
 
-def _add_suppression(db: Session, *, tenant_id: int | None, email: str, reason: str) -> None:
-    if tenant_id is None:
-        logger.warning("No tenant_id available; skipping suppression for %s", email)
+async def _add_suppressions(db: AsyncSession, *, tenant_ids: set[int | None], emails: set[str], reason: str) -> None:
+    """Suppress every (tenant, email) pair with one conflict-ignoring insert, then mark the newly suppressed subscribers."""
+    if None in tenant_ids:
+        logger.warning("No tenant_id available; skipping suppression for %s", ", ".join(sorted(emails)))
+        tenant_ids = tenant_ids - {None}
+    if not tenant_ids or not emails:
         return
     try:
-        existing = (
-            db.query(models.SuppressedEmail)
-            .filter(models.SuppressedEmail.tenant_id == tenant_id, models.SuppressedEmail.email == email)
-            .first()
-        )
-        if existing:
-            return
-        db.add(models.SuppressedEmail(tenant_id=tenant_id, email=email, reason=reason))
-        subscriber = (
-            db.query(models.Subscriber)
-            .filter(models.Subscriber.tenant_id == tenant_id, models.Subscriber.email == email)
-            .first()
-        )
-        if subscriber:
-            subscriber.status = "suppressed"
-            db.add(subscriber)
+        # A savepoint keeps a failure here from aborting the transaction the event rows still need.
+        async with db.begin_nested():
+            result = await db.execute(
+                insert_ignore_conflicts(db, models.SuppressedEmail, ["tenant_id", "email"]).returning(
+                    models.SuppressedEmail.tenant_id, models.SuppressedEmail.email
+                ),
+                [
+                    {"tenant_id": tenant_id, "email": email, "reason": reason}
+                    for tenant_id in tenant_ids
+                    for email in emails
+                ],
+            )
+            new_pairs = [tuple(row) for row in result.all()]
+            if new_pairs:
+                await db.execute(
+                    update(models.Subscriber)
+                    .where(tuple_(models.Subscriber.tenant_id, models.Subscriber.email).in_(new_pairs))
+                    .values(status="suppressed")
+                    .execution_options(synchronize_session=False)
+                )
     except Exception:
-        logger.exception("Failed to update suppression for %s", email)
+        logger.exception("Failed to update suppression for %s", ", ".join(sorted(emails)))
 
 
 @router.post("/sns")
-async def handle_sns_notification(payload: dict, db: Session = Depends(get_db)) -> dict[str, str]:
+async def handle_sns_notification(payload: dict, db: AsyncSession = Depends(get_async_db)) -> dict[str, str]:
     """Handle SES SNS notifications for bounces/complaints."""
     message_type = payload.get("Type")
     topic_arn = payload.get("TopicArn")
@@ -126,7 +235,10 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
     signature_verified = False
     skip_verification = settings.environment == "development" and settings.sns_skip_signature_verification
     if settings.sns_verify_signatures and not skip_verification:
-        verified, reason = verify_sns_signature(payload, settings.sns_signature_timeout_seconds)
+        # The first message per certificate fetches it over HTTPS, so keep verification off the event loop.
+        verified, reason = await asyncio.to_thread(
+            verify_sns_signature, payload, settings.sns_signature_timeout_seconds
+        )
         if not verified:
             logger.warning("Rejected SNS message %s: %s", sns_message_id, reason)
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid SNS signature")
@@ -136,7 +248,9 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
         subscribe_url = payload.get("SubscribeURL")
         if not subscribe_url:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing SubscribeURL")
-        confirmed = confirm_subscription(subscribe_url, settings.sns_signature_timeout_seconds)
+        confirmed = await asyncio.to_thread(
+            confirm_subscription, subscribe_url, settings.sns_signature_timeout_seconds
+        )
         logger.info("SNS subscription confirmation=%s message_id=%s", confirmed, sns_message_id)
         return {"status": "confirmed" if confirmed else "failed"}
     if message_type == "UnsubscribeConfirmation":
@@ -145,6 +259,36 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
     if message_type != "Notification":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported SNS message type")
 
+    dedup_key = f"sns:evt:{topic_arn}:{sns_message_id}" if topic_arn and sns_message_id else None
+    claimed = await _claim_sns_message(dedup_key) if dedup_key else None
+    if claimed is False:
+        logger.info("Skipping redelivered SNS message %s", sns_message_id)
+        return {"status": "duplicate"}
+    try:
+        return await _process_notification(
+            db,
+            payload,
+            topic_arn=topic_arn,
+            sns_message_id=sns_message_id,
+            signature_verified=signature_verified,
+            claimed=claimed,
+        )
+    except BaseException:
+        # Let SNS retry a message we failed to process, including when the request was cancelled.
+        if claimed:
+            await asyncio.shield(_release_sns_message(dedup_key))
+        raise
+
+
+async def _process_notification(
+    db: AsyncSession,
+    payload: dict,
+    *,
+    topic_arn: str | None,
+    sns_message_id: str | None,
+    signature_verified: bool,
+    claimed: bool | None,
+) -> dict[str, str]:
     message_body = payload.get("Message")
     if not message_body:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing SNS Message body")
@@ -153,8 +297,8 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
         message = message_body
     else:
         try:
-            message = json.loads(message_body)
-        except json.JSONDecodeError:
+            message = _json_loads(message_body)
+        except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid SNS Message JSON")
 
     mail = message.get("mail") or {}
@@ -162,6 +306,8 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
     destinations = mail.get("destination") or []
     if isinstance(destinations, str):
         destinations = [destinations]
+    # SES preserves the case it was given; stored addresses are lower-cased.
+    destinations = [destination.lower() for destination in destinations]
     notification_type = (message.get("notificationType") or "").lower()
 
     event_type = notification_type or "unknown"
@@ -184,7 +330,7 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
         bounce_subtype = bounce.get("bounceSubType")
         event_time = _parse_timestamp(bounce.get("timestamp"))
         bounced_recipients = [
-            recipient.get("emailAddress")
+            recipient["emailAddress"].lower()
             for recipient in bounce.get("bouncedRecipients") or []
             if recipient.get("emailAddress")
         ]
@@ -195,7 +341,7 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
         complaint_user_agent = complaint.get("userAgent")
         event_time = _parse_timestamp(complaint.get("timestamp"))
         complained_recipients = [
-            recipient.get("emailAddress")
+            recipient["emailAddress"].lower()
             for recipient in complaint.get("complainedRecipients") or []
             if recipient.get("emailAddress")
         ]
@@ -210,11 +356,11 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
 
     logs: list[models.EmailLog] = []
     if ses_message_id:
-        query = db.query(models.EmailLog).filter(models.EmailLog.message_id == ses_message_id)
+        params = {"ses_message_id": ses_message_id}
         if destinations:
-            logs = query.filter(models.EmailLog.recipient_email.in_(destinations)).all()
+            logs = list(await db.scalars(_LOGS_BY_MESSAGE_ID_AND_RECIPIENT, {**params, "recipients": destinations}))
         if not logs:
-            logs = query.all()
+            logs = list(await db.scalars(_LOGS_BY_MESSAGE_ID, params))
 
     if logs:
         _update_logs(
@@ -237,35 +383,26 @@ async def handle_sns_notification(payload: dict, db: Session = Depends(get_db))
             )
             if should_suppress:
                 recipients = bounced_recipients or complained_recipients or destinations
-                for log in logs:
-                    for recipient_email in recipients or []:
-                        _add_suppression(db, tenant_id=log.tenant_id, email=recipient_email, reason=reason)
+                await _add_suppressions(
+                    db,
+                    tenant_ids={log.tenant_id for log in logs},
+                    emails=set(recipients or []),
+                    reason=reason,
+                )
     else:
         logger.warning("EmailLog not found for ses_message_id=%s", ses_message_id)
 
-    if logs:
-        for log in logs:
-            _persist_event(
-                db,
-                email_log_id=log.id,
-                ses_message_id=ses_message_id,
-                sns_message_id=sns_message_id,
-                event_type=event_type,
-                topic_arn=topic_arn,
-                signature_verified=signature_verified,
-                payload=payload,
-            )
-    else:
-        _persist_event(
-            db,
-            email_log_id=None,
-            ses_message_id=ses_message_id,
-            sns_message_id=sns_message_id,
-            event_type=event_type,
-            topic_arn=topic_arn,
-            signature_verified=signature_verified,
-            payload=payload,
-        )
+    await _persist_events(
+        db,
+        email_log_ids=[log.id for log in logs] or [None],
+        ses_message_id=ses_message_id,
+        sns_message_id=sns_message_id,
+        event_type=event_type,
+        topic_arn=topic_arn,
+        signature_verified=signature_verified,
+        payload=payload,
+        claimed=claimed,
+    )
 
-    db.commit()
+    await db.commit()
     return {"status": new_status}
@@ -1,6 +1,8 @@
 """Routes for sending transactional emails."""
 from __future__ import annotations
 
+from uuid import uuid4
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, field_validator
 from sqlalchemy.orm import Session
@@ -12,9 +14,10 @@ from src.db.session import get_db
 from src.queue.worker import enqueue_email_job
 from src.services.ses import ses_service
 from src.utils.logger import logger
+from src.utils.validation import normalize_email
 
 router = APIRouter(prefix="/send", tags=["send"])
-_rate_limiter = create_rate_limiter(settings.rate_limit_per_minute)
+_rate_limiter = create_rate_limiter(settings.rate_limit_per_minute, settings.redis_url)
 
 
 class SendTestRequest(BaseModel):
@@ -26,9 +29,7 @@ class SendTestRequest(BaseModel):
     @field_validator("recipient")
     @classmethod
     def validate_recipient(cls, value: str) -> str:
-        if "@" not in value:
-            raise ValueError("recipient must be an email address")
-        return value
+        return normalize_email(value)
 
 
 class SendTestResponse(BaseModel):
@@ -43,23 +44,23 @@ async def send_test_email(request: SendTestRequest, db: Session = Depends(get_db
     await _rate_limiter.check("global-test")
 
     if request.enqueue:
+        # Reserve the RQ job id up front so the log row is written once, with provider_job_id set.
+        job_id = uuid4().hex
         email_log = models.EmailLog(
             recipient_email=request.recipient,
             status="queued",
+            provider_job_id=job_id,
         )
         db.add(email_log)
         db.commit()
-        db.refresh(email_log)
-        job = enqueue_email_job(
+        enqueue_email_job(
             subject=request.subject,
             recipient=request.recipient,
             body=request.body,
             email_log_id=email_log.id,
+            job_id=job_id,
         )
-        email_log.provider_job_id = job.id
-        db.add(email_log)
-        db.commit()
-        return SendTestResponse(message_id=job.id, queued=True)
+        return SendTestResponse(message_id=job_id, queued=True)
 
     message_id = ses_service.send_email(
         subject=request.subject,
@@ -3,15 +3,45 @@ from __future__ import annotations
 
 import csv
 import io
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from pydantic import BaseModel, field_validator
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from pydantic import BaseModel, ConfigDict, field_validator
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.api.pagination import keyset_page, split_page
 from src.db import models
 from src.db.session import get_db
+from src.db.upsert import insert_ignore_conflicts
+from src.utils.validation import normalize_email
 
 router = APIRouter(prefix="/subscribers", tags=["subscribers"])
 
+# Columns backing SubscriberResponse; selected directly to skip ORM hydration.
+_SUBSCRIBER_COLS = (
+    models.Subscriber.id,
+    models.Subscriber.tenant_id,
+    models.Subscriber.email,
+    models.Subscriber.first_name,
+    models.Subscriber.last_name,
+    models.Subscriber.status,
+)
+# Rows per INSERT (and per transaction) during CSV imports.
+IMPORT_BATCH_SIZE = 1000
+# Rows per COPY (and per transaction) when importing into PostgreSQL.
+COPY_BATCH_SIZE = 50_000
+
+_CREATE_IMPORT_TABLE = (
+    "CREATE TEMP TABLE IF NOT EXISTS subscriber_import "
+    "(tenant_id integer, email varchar(320), first_name varchar(120), last_name varchar(120)) "
+    "ON COMMIT DELETE ROWS"
+)
+_COPY_IMPORT_ROWS = "COPY subscriber_import (tenant_id, email, first_name, last_name) FROM STDIN"
+_MERGE_IMPORT_ROWS = (
+    "INSERT INTO subscribers (tenant_id, email, first_name, last_name, status) "
+    "SELECT tenant_id, email, first_name, last_name, 'active' FROM subscriber_import "
+    "ON CONFLICT (tenant_id, email) DO NOTHING"
+)
+
 
 class SubscriberCreate(BaseModel):
     tenant_id: int
@@ -22,9 +52,7 @@ class SubscriberCreate(BaseModel):
     @field_validator("email")
     @classmethod
     def validate_email(cls, value: str) -> str:
-        if "@" not in value:
-            raise ValueError("email must be valid")
-        return value
+        return normalize_email(value)
 
 
 class SubscriberUpdate(BaseModel):
@@ -41,13 +69,24 @@ class SubscriberResponse(BaseModel):
     last_name: str | None = None
     status: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_orm_fast(cls, obj: models.Subscriber) -> SubscriberResponse:
+        """Build from a loaded row without re-running validators on typed column values."""
+        return cls.model_construct(
+            id=obj.id,
+            tenant_id=obj.tenant_id,
+            email=obj.email,
+            first_name=obj.first_name,
+            last_name=obj.last_name,
+            status=obj.status,
+        )
 
-class BulkImportRequest(BaseModel):
-    tenant_id: int
-    csv_text: str
+
+class SubscriberPage(BaseModel):
+    items: list[SubscriberResponse]
+    next_cursor: str | None = None
 
 
 class BulkImportResponse(BaseModel):
@@ -56,7 +95,7 @@ class BulkImportResponse(BaseModel):
 
 
 def _get_subscriber(db: Session, subscriber_id: int) -> models.Subscriber:
-    subscriber = db.query(models.Subscriber).filter(models.Subscriber.id == subscriber_id).first()
+    subscriber = db.get(models.Subscriber, subscriber_id)
     if subscriber is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscriber not found")
     return subscriber
@@ -66,38 +105,39 @@ def _get_subscriber(db: Session, subscriber_id: int) -> models.Subscriber:
 def add_subscriber(payload: SubscriberCreate, db: Session = Depends(get_db)) -> SubscriberResponse:
     """Add a subscriber to a tenant list if not already present."""
 
-    existing = (
-        db.query(models.Subscriber)
-        .filter(models.Subscriber.tenant_id == payload.tenant_id, models.Subscriber.email == payload.email)
-        .first()
+    stmt = (
+        insert_ignore_conflicts(db, models.Subscriber, ["tenant_id", "email"])
+        .values(
+            tenant_id=payload.tenant_id,
+            email=payload.email,
+            first_name=payload.first_name,
+            last_name=payload.last_name,
+        )
+        .returning(models.Subscriber)
     )
-    if existing:
+    subscriber = db.execute(stmt).scalar_one_or_none()
+    if subscriber is None:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Subscriber already exists")
-
-    subscriber = models.Subscriber(
-        tenant_id=payload.tenant_id,
-        email=payload.email,
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-    )
-    db.add(subscriber)
     db.commit()
-    db.refresh(subscriber)
-    return SubscriberResponse.from_orm(subscriber)
+    return SubscriberResponse.from_orm_fast(subscriber)
 
 
-@router.get("/", response_model=list[SubscriberResponse])
+@router.get("/", response_model=SubscriberPage)
 def list_subscribers(
     tenant_id: int | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     db: Session = Depends(get_db),
-) -> list[SubscriberResponse]:
-    """List subscribers, optionally filtered by tenant."""
+) -> SubscriberPage:
+    """List subscribers newest first, optionally filtered by tenant."""
 
-    query = db.query(models.Subscriber)
+    stmt = select(*_SUBSCRIBER_COLS, models.Subscriber.created_at)
     if tenant_id is not None:
-        query = query.filter(models.Subscriber.tenant_id == tenant_id)
-    subscribers = query.order_by(models.Subscriber.created_at.desc()).all()
-    return [SubscriberResponse.from_orm(s) for s in subscribers]
+        stmt = stmt.where(models.Subscriber.tenant_id == tenant_id)
+    stmt = keyset_page(stmt, models.Subscriber.created_at, models.Subscriber.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(db.execute(stmt).mappings().all(), limit)
+    return SubscriberPage(items=[SubscriberResponse.model_construct(**row) for row in rows], next_cursor=next_cursor)
 
 
 @router.get("/{subscriber_id}", response_model=SubscriberResponse)
@@ -105,7 +145,7 @@ def get_subscriber(subscriber_id: int, db: Session = Depends(get_db)) -> Subscri
     """Retrieve a subscriber by ID."""
 
     subscriber = _get_subscriber(db, subscriber_id)
-    return SubscriberResponse.from_orm(subscriber)
+    return SubscriberResponse.from_orm_fast(subscriber)
 
 
 @router.patch("/{subscriber_id}", response_model=SubscriberResponse)
@@ -126,8 +166,7 @@ def update_subscriber(
 
     db.add(subscriber)
     db.commit()
-    db.refresh(subscriber)
-    return SubscriberResponse.from_orm(subscriber)
+    return SubscriberResponse.from_orm_fast(subscriber)
 
 
 @router.delete("/{subscriber_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
@@ -140,38 +179,84 @@ def delete_subscriber(subscriber_id: int, db: Session = Depends(get_db)) -> Resp
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+def _insert_subscriber_batch(db: Session, rows: list[dict]) -> int:
+    # The unique (tenant_id, email) index skips existing and repeated subscribers in the same round trip.
+    stmt = insert_ignore_conflicts(db, models.Subscriber, ["tenant_id", "email"]).returning(models.Subscriber.id)
+    created = len(db.execute(stmt, rows).all())
+    db.commit()
+    return created
+
+
+def _copy_subscriber_batch(db: Session, rows: list[dict]) -> int:
+    """Stream a batch into a temp table with COPY, then merge it with a single INSERT ... SELECT."""
+
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.execute(_CREATE_IMPORT_TABLE)
+        with cursor.copy(_COPY_IMPORT_ROWS) as copy:
+            for row in rows:
+                copy.write_row((row["tenant_id"], row["email"], row["first_name"], row["last_name"]))
+        cursor.execute(_MERGE_IMPORT_ROWS)
+        created = cursor.rowcount
+    db.commit()
+    return created
+
+
 @router.post("/bulk-import", response_model=BulkImportResponse)
-def bulk_import_subscribers(payload: BulkImportRequest, db: Session = Depends(get_db)) -> BulkImportResponse:
-    """Import subscribers from CSV text (columns: email, first_name, last_name)."""
+def bulk_import_subscribers(
+    tenant_id: int = Form(...),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+) -> BulkImportResponse:
+    """Import subscribers from an uploaded CSV file (columns: email, first_name, last_name).
 
-    created = 0
-    skipped = 0
-    reader = csv.DictReader(io.StringIO(payload.csv_text.strip()))
+    The file is streamed and inserted in batches, so memory use does not grow with its size.
+    """
+
+    reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""))
+    try:
+        fieldnames = reader.fieldnames
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"CSV could not be read: {exc}") from exc
     required_columns = {"email"}
-    if not required_columns.issubset(set(reader.fieldnames or [])):
+    if not required_columns.issubset(set(fieldnames or [])):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must include email column")
 
-    for row in reader:
-        email = (row.get("email") or "").strip()
-        if not email or "@" not in email:
-            skipped += 1
-            continue
-        exists = (
-            db.query(models.Subscriber)
-            .filter(models.Subscriber.tenant_id == payload.tenant_id, models.Subscriber.email == email)
-            .first()
-        )
-        if exists:
-            skipped += 1
-            continue
-        subscriber = models.Subscriber(
-            tenant_id=payload.tenant_id,
-            email=email,
-            first_name=(row.get("first_name") or "").strip() or None,
-            last_name=(row.get("last_name") or "").strip() or None,
-        )
-        db.add(subscriber)
-        created += 1
+    if db.get_bind().dialect.driver == "psycopg":
+        flush_batch, batch_size = _copy_subscriber_batch, COPY_BATCH_SIZE
+    else:
+        flush_batch, batch_size = _insert_subscriber_batch, IMPORT_BATCH_SIZE
 
-    db.commit()
-    return BulkImportResponse(imported=created, skipped=skipped)
+    total = 0
+    created = 0
+    batch: list[dict] = []
+    try:
+        for row in reader:
+            total += 1
+            try:
+                email = normalize_email(row.get("email") or "")
+            except ValueError:
+                continue
+            batch.append(
+                {
+                    "tenant_id": tenant_id,
+                    "email": email,
+                    "first_name": (row.get("first_name") or "").strip() or None,
+                    "last_name": (row.get("last_name") or "").strip() or None,
+                }
+            )
+            if len(batch) >= batch_size:
+                created += flush_batch(db, batch)
+                batch = []
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # Earlier batches are already committed; say so rather than implying nothing was imported.
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"CSV could not be read after row {total}: {exc}. "
+                f"Import is partial: {created} subscribers from earlier rows were imported."
+            ),
+        ) from exc
+    if batch:
+        created += flush_batch(db, batch)
+    return BulkImportResponse(imported=created, skipped=total - created)
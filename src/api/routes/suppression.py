@@ -2,14 +2,26 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.api.pagination import keyset_page, split_page
 from src.db import models
 from src.db.session import get_db
+from src.db.upsert import insert_ignore_conflicts
+from src.utils.validation import normalize_email
 
 router = APIRouter(prefix="/suppression", tags=["suppression"])
 
+# Columns backing SuppressionResponse; selected directly to skip ORM hydration.
+_SUPPRESSION_COLS = (
+    models.SuppressedEmail.id,
+    models.SuppressedEmail.tenant_id,
+    models.SuppressedEmail.email,
+    models.SuppressedEmail.reason,
+)
+
 
 class SuppressionCreate(BaseModel):
     tenant_id: int
@@ -19,9 +31,7 @@ class SuppressionCreate(BaseModel):
     @field_validator("email")
     @classmethod
     def validate_email(cls, value: str) -> str:
-        if "@" not in value:
-            raise ValueError("email must be valid")
-        return value
+        return normalize_email(value)
 
 
 class SuppressionResponse(BaseModel):
@@ -30,12 +40,26 @@ class SuppressionResponse(BaseModel):
     email: str
     reason: str | None = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj: models.SuppressedEmail) -> SuppressionResponse:
+        """Build from a loaded row without re-running validators on typed column values."""
+        return cls.model_construct(
+            id=obj.id,
+            tenant_id=obj.tenant_id,
+            email=obj.email,
+            reason=obj.reason,
+        )
+
+
+class SuppressionPage(BaseModel):
+    items: list[SuppressionResponse]
+    next_cursor: str | None = None
 
 
 def _get_entry(db: Session, entry_id: int) -> models.SuppressedEmail:
-    entry = db.query(models.SuppressedEmail).filter(models.SuppressedEmail.id == entry_id).first()
+    entry = db.get(models.SuppressedEmail, entry_id)
     if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Suppression not found")
     return entry
@@ -45,34 +69,34 @@ def _get_entry(db: Session, entry_id: int) -> models.SuppressedEmail:
 def add_suppression(payload: SuppressionCreate, db: Session = Depends(get_db)) -> SuppressionResponse:
     """Add an email to the suppression list."""
 
-    existing = (
-        db.query(models.SuppressedEmail)
-        .filter(models.SuppressedEmail.tenant_id == payload.tenant_id, models.SuppressedEmail.email == payload.email)
-        .first()
+    stmt = (
+        insert_ignore_conflicts(db, models.SuppressedEmail, ["tenant_id", "email"])
+        .values(tenant_id=payload.tenant_id, email=payload.email, reason=payload.reason)
+        .returning(models.SuppressedEmail)
     )
-    if existing:
+    entry = db.execute(stmt).scalar_one_or_none()
+    if entry is None:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already suppressed")
-
-    entry = models.SuppressedEmail(
-        tenant_id=payload.tenant_id,
-        email=payload.email,
-        reason=payload.reason,
-    )
-    db.add(entry)
     db.commit()
-    db.refresh(entry)
-    return SuppressionResponse.from_orm(entry)
+    return SuppressionResponse.from_orm_fast(entry)
 
 
-@router.get("/", response_model=list[SuppressionResponse])
-def list_suppression(tenant_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[SuppressionResponse]:
-    """List suppressed emails optionally filtered by tenant."""
+@router.get("/", response_model=SuppressionPage)
+def list_suppression(
+    tenant_id: int | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> SuppressionPage:
+    """List suppressed emails newest first, optionally filtered by tenant."""
 
-    query = db.query(models.SuppressedEmail)
+    stmt = select(*_SUPPRESSION_COLS, models.SuppressedEmail.created_at)
     if tenant_id is not None:
-        query = query.filter(models.SuppressedEmail.tenant_id == tenant_id)
-    entries = query.order_by(models.SuppressedEmail.created_at.desc()).all()
-    return [SuppressionResponse.from_orm(entry) for entry in entries]
+        stmt = stmt.where(models.SuppressedEmail.tenant_id == tenant_id)
+    stmt = keyset_page(stmt, models.SuppressedEmail.created_at, models.SuppressedEmail.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(db.execute(stmt).mappings().all(), limit)
+    return SuppressionPage(items=[SuppressionResponse.model_construct(**row) for row in rows], next_cursor=next_cursor)
 
 
 @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
@@ -1,15 +1,27 @@
 """Tenant management endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.api.pagination import keyset_page, split_page
+from src.api.routes.campaigns import campaign_cache
+from src.api.routes.domains import domain_status_cache
 from src.db import models
 from src.db.session import get_db
 
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 
+# Columns backing TenantResponse; selected directly to skip ORM hydration.
+_TENANT_COLS = (
+    models.Tenant.id,
+    models.Tenant.name,
+    models.Tenant.contact_email,
+    models.Tenant.ses_verified,
+)
+
 
 class TenantCreate(BaseModel):
     name: str
@@ -27,12 +39,26 @@ class TenantResponse(BaseModel):
     contact_email: EmailStr
     ses_verified: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj: models.Tenant) -> TenantResponse:
+        """Build from a loaded row without re-running validators on typed column values."""
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            contact_email=obj.contact_email,
+            ses_verified=obj.ses_verified,
+        )
+
+
+class TenantPage(BaseModel):
+    items: list[TenantResponse]
+    next_cursor: str | None = None
 
 
 def _get_tenant(db: Session, tenant_id: int) -> models.Tenant:
-    tenant = db.query(models.Tenant).filter(models.Tenant.id == tenant_id).first()
+    tenant = db.get(models.Tenant, tenant_id)
     if tenant is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
     return tenant
@@ -45,16 +71,21 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db)) -> Tenan
     tenant = models.Tenant(name=payload.name, contact_email=payload.contact_email)
     db.add(tenant)
     db.commit()
-    db.refresh(tenant)
-    return TenantResponse.from_orm(tenant)
+    return TenantResponse.from_orm_fast(tenant)
 
 
-@router.get("/", response_model=list[TenantResponse])
-def list_tenants(db: Session = Depends(get_db)) -> list[TenantResponse]:
-    """List all tenants."""
+@router.get("/", response_model=TenantPage)
+def list_tenants(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> TenantPage:
+    """List tenants newest first."""
 
-    tenants = db.query(models.Tenant).order_by(models.Tenant.created_at.desc()).all()
-    return [TenantResponse.from_orm(t) for t in tenants]
+    stmt = select(*_TENANT_COLS, models.Tenant.created_at)
+    stmt = keyset_page(stmt, models.Tenant.created_at, models.Tenant.id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(db.execute(stmt).mappings().all(), limit)
+    return TenantPage(items=[TenantResponse.model_construct(**row) for row in rows], next_cursor=next_cursor)
 
 
 @router.get("/{tenant_id}", response_model=TenantResponse)
@@ -62,7 +93,7 @@ def get_tenant(tenant_id: int, db: Session = Depends(get_db)) -> TenantResponse:
     """Fetch a single tenant."""
 
     tenant = _get_tenant(db, tenant_id)
-    return TenantResponse.from_orm(tenant)
+    return TenantResponse.from_orm_fast(tenant)
 
 
 @router.patch("/{tenant_id}", response_model=TenantResponse)
@@ -76,8 +107,7 @@ def update_tenant(tenant_id: int, payload: TenantUpdate, db: Session = Depends(g
         tenant.contact_email = payload.contact_email
     db.add(tenant)
     db.commit()
-    db.refresh(tenant)
-    return TenantResponse.from_orm(tenant)
+    return TenantResponse.from_orm_fast(tenant)
 
 
 @router.delete("/{tenant_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
@@ -87,4 +117,7 @@ def delete_tenant(tenant_id: int, db: Session = Depends(get_db)) -> Response:
     tenant = _get_tenant(db, tenant_id)
     db.delete(tenant)
     db.commit()
+    domain_status_cache.pop(tenant_id)
+    # The tenant's campaigns went with it; deletes are rare, so drop every cached campaign.
+    campaign_cache.clear()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
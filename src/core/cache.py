@@ -0,0 +1,38 @@
+"""Small in-process response cache for read-mostly endpoints."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Hashable
+
+from cachetools import TTLCache
+
+
+class ResponseCache:
+    """Thread-safe TTL cache; entries are per process, so keep the TTL short."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30) -> None:
+        self.ttl = ttl
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    @property
+    def cache_control(self) -> str:
+        """``Cache-Control`` value telling clients how stale a cached response may be."""
+
+        return f"private, max-age={int(self.ttl)}"
@@ -1,37 +1,127 @@
-"""Simple in-memory rate limiting helper for demonstration purposes."""
+"""Per-tenant rate limiting backed by Redis, with an in-memory fallback."""
 from __future__ import annotations
 
-import asyncio
+import threading
 import time
-from typing import Dict, Tuple
+from typing import Any, Dict, List
 
 from fastapi import HTTPException, status
 
+try:  # pragma: no cover - optional dependency import
+    import redis.asyncio as aioredis  # type: ignore
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore
+
+from src.utils.logger import logger
+
+_SHARD_COUNT = 64
+_MS_MASK = (1 << 32) - 1
+# Tokens are tracked in thousandths so short gaps between requests still refill something.
+_TOKEN_UNIT = 1000
+
+
+class ShardedTokenBucket:
+    """Per-key token buckets spread over lock-guarded shards.
+
+    Each bucket is one packed int, ``(milli_tokens << 32) | last_refill_ms``, so an update is a
+    single dict store under a short, non-async shard lock instead of a process-wide await.
+    """
+
+    def __init__(self, capacity: int, shards: int = _SHARD_COUNT) -> None:
+        self.capacity = capacity
+        self._capacity_units = capacity * _TOKEN_UNIT
+        self._mask = shards - 1
+        self._shards: List[Dict[str, int]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        # Refill timestamps are stored relative to this origin so they fit in 32 bits.
+        self._origin = time.monotonic()
+
+    def try_acquire(self, key: str) -> bool:
+        now_ms = int((time.monotonic() - self._origin) * 1000) & _MS_MASK
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            state = shard.get(key)
+            if state is None:
+                current, last_refill_ms = self._capacity_units, now_ms
+            else:
+                current, last_refill_ms = state >> 32, state & _MS_MASK
+            elapsed_ms = (now_ms - last_refill_ms) & _MS_MASK
+            # capacity tokens per 60_000 ms, in milli-tokens: elapsed_ms * capacity / 60.
+            added = elapsed_ms * self.capacity // 60
+            if current + added >= self._capacity_units:
+                current, last_refill_ms = self._capacity_units, now_ms
+            else:
+                current += added
+                # Only advance the clock by the time those milli-tokens took, so the remainder
+                # carries over instead of starving callers that poll faster than one unit.
+                last_refill_ms = (last_refill_ms + -(-added * 60 // self.capacity)) & _MS_MASK
+            allowed = current >= _TOKEN_UNIT
+            if allowed:
+                current -= _TOKEN_UNIT
+            shard[key] = (current << 32) | last_refill_ms
+            return allowed
+
+
+# KEYS[1] = bucket key, ARGV[1] = now in ms, ARGV[2] = tokens per minute.
+_TOKEN_BUCKET_LUA = """
+local cap = tonumber(ARGV[2])
+local now = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or cap
+local ts = tonumber(state[2]) or now
+tokens = math.min(cap, tokens + math.max(0, now - ts) * cap / 60000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return allowed
+"""
+_REDIS_TIMEOUT_SECONDS = 0.5
+# After a Redis failure, use the local buckets for a while instead of paying a timeout per request.
+_REDIS_RETRY_AFTER_SECONDS = 5.0
+
 
 class RateLimiter:
-    """Naive per-tenant rate limiter implemented with an in-memory bucket."""
+    """Per-tenant token bucket shared by every worker through a Redis Lua script.
+
+    Falls back to a per-process ``ShardedTokenBucket`` when Redis is not configured or unreachable.
+    """
 
-    def __init__(self, max_per_minute: int) -> None:
+    def __init__(self, max_per_minute: int, redis_url: str | None = None) -> None:
         self.max_per_minute = max_per_minute
-        self._allowance: Dict[str, Tuple[int, float]] = {}
-        self._lock = asyncio.Lock()
+        self._buckets = ShardedTokenBucket(max_per_minute)
+        self._script: Any | None = None
+        self._redis_retry_at = 0.0
+        if redis_url and aioredis is not None:
+            client = aioredis.Redis.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+                socket_timeout=_REDIS_TIMEOUT_SECONDS,
+            )
+            self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def _try_acquire(self, key: str) -> bool:
+        if self._script is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                allowed = await self._script(keys=[f"rl:{key}"], args=[int(time.time() * 1000), self.max_per_minute])
+                return bool(allowed)
+            except Exception as exc:
+                logger.warning("Redis rate limiter unavailable, using in-process buckets: %s", exc)
+                self._redis_retry_at = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        return self._buckets.try_acquire(key)
 
     async def check(self, key: str) -> None:
-        now = time.monotonic()
-        async with self._lock:
-            current, last_refill = self._allowance.get(key, (self.max_per_minute, now))
-            elapsed = now - last_refill
-            refill = int(elapsed / 60 * self.max_per_minute)
-            if refill > 0:
-                current = min(self.max_per_minute, current + refill)
-                last_refill = now
-            if current <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded. Please try again shortly.",
-                )
-            self._allowance[key] = (current - 1, last_refill)
-
-
-def create_rate_limiter(max_per_minute: int) -> RateLimiter:
-    return RateLimiter(max_per_minute=max_per_minute)
+        if not await self._try_acquire(key):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please try again shortly.",
+            )
+
+
+def create_rate_limiter(max_per_minute: int, redis_url: str | None = None) -> RateLimiter:
+    return RateLimiter(max_per_minute=max_per_minute, redis_url=redis_url)
@@ -1,13 +1,27 @@
 """Database models for the email delivery platform."""
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declarative_base, relationship, validates
+from sqlalchemy.sql.functions import now
 
-from src.utils.datetime import utcnow
 Base = declarative_base()
 
 
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw) -> str:
+    # SQLite's CURRENT_TIMESTAMP has no fractional seconds, while bound datetimes are stored as
+    # "YYYY-MM-DD HH:MM:SS.ffffff"; match that format so (created_at, id) keyset comparisons hold.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def _lower_email(value: str | None) -> str | None:
+    # Addresses are stored lower-cased so equality/IN lookups can use plain b-tree indexes.
+    return value.lower() if value else value
+
+
 class Tenant(Base):
     __tablename__ = "tenants"
 
@@ -33,6 +47,7 @@ class Campaign(Base):
     status = Column(String(50), default="draft")
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     tenant = relationship("Tenant", back_populates="campaigns")
     email_logs = relationship("EmailLog", back_populates="campaign")
@@ -49,8 +64,21 @@ class Subscriber(Base):
     status = Column(String(50), default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Conflict target for the ON CONFLICT DO NOTHING subscriber inserts.
+        Index("ix_subscribers_tenant_email", tenant_id, email, unique=True),
+        # Campaign recipient scans filter on tenant and status and page through ids in order.
+        Index("ix_subscribers_tenant_status_id", tenant_id, status, id),
+        # Matches the keyset pagination order of the subscriber listing.
+        Index("ix_subscribers_tenant_created", tenant_id, created_at.desc(), id.desc()),
+    )
+
     tenant = relationship("Tenant", back_populates="subscribers")
 
+    @validates("email")
+    def _normalize_email(self, key: str, value: str) -> str:
+        return _lower_email(value)
+
 
 class EmailLog(Base):
     __tablename__ = "email_logs"
@@ -60,7 +88,7 @@ class EmailLog(Base):
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
     subscriber_id = Column(Integer, ForeignKey("subscribers.id"), nullable=True)
     recipient_email = Column(String(320), nullable=True, index=True)
-    message_id = Column(String(255), nullable=True, index=True)
+    message_id = Column(String(255), nullable=True)
     provider_job_id = Column(String(255), nullable=True, index=True)
     status = Column(String(50), default="queued")
     last_event_type = Column(String(50), nullable=True)
@@ -69,13 +97,32 @@ class EmailLog(Base):
     bounce_type = Column(String(255), nullable=True)
     bounce_subtype = Column(String(255), nullable=True)
     complaint_type = Column(String(255), nullable=True)
-    sent_at = Column(DateTime(timezone=True), default=utcnow)
+    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Matches the keyset pagination order used by the email log listings.
+        Index("ix_email_logs_tenant_created", tenant_id, created_at.desc(), id.desc()),
+        # Covers the campaign log listing so PostgreSQL can answer it with an index-only scan.
+        Index(
+            "ix_email_logs_campaign_created",
+            campaign_id,
+            created_at.desc(),
+            id.desc(),
+            postgresql_include=["tenant_id", "subscriber_id", "recipient_email", "message_id", "status"],
+        ),
+        # SNS callbacks look logs up by SES message id; queued rows without one stay out of the index.
+        Index("ix_email_logs_message_id", message_id, postgresql_where=message_id.isnot(None)),
+    )
+
     campaign = relationship("Campaign", back_populates="email_logs")
     events = relationship("EmailEvent", back_populates="email_log", cascade="all, delete-orphan")
 
+    @validates("recipient_email")
+    def _normalize_recipient_email(self, key: str, value: str | None) -> str | None:
+        return _lower_email(value)
+
 
 class EmailEvent(Base):
     __tablename__ = "email_events"
@@ -87,9 +134,32 @@ class EmailEvent(Base):
     event_type = Column(String(50), nullable=False)
     topic_arn = Column(String(512), nullable=True)
     received_at = Column(DateTime(timezone=True), server_default=func.now())
-    payload_json = Column(Text, nullable=False)
+    # JSONB on PostgreSQL (queryable, e.g. payload_json->>'Type'); plain JSON elsewhere for tests.
+    payload_json = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     signature_verified = Column(Boolean, default=False)
 
+    __table_args__ = (
+        # One row per (SNS message, matched log): conflict targets that make SNS redeliveries no-ops
+        # even when the Redis dedup claim has expired or been lost.
+        Index(
+            "ix_email_events_sns_message_log",
+            topic_arn,
+            sns_message_id,
+            email_log_id,
+            unique=True,
+            postgresql_where=email_log_id.isnot(None),
+            sqlite_where=email_log_id.isnot(None),
+        ),
+        Index(
+            "ix_email_events_sns_message_unmatched",
+            topic_arn,
+            sns_message_id,
+            unique=True,
+            postgresql_where=email_log_id.is_(None),
+            sqlite_where=email_log_id.is_(None),
+        ),
+    )
+
     email_log = relationship("EmailLog", back_populates="events")
 
 
@@ -98,8 +168,19 @@ class SuppressedEmail(Base):
 
     id = Column(Integer, primary_key=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
-    email = Column(String(320), nullable=False, index=True)
+    email = Column(String(320), nullable=False)
     reason = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Conflict target for the ON CONFLICT DO NOTHING suppression inserts; also serves email lookups.
+        Index("ix_suppressed_emails_tenant_email", tenant_id, email, unique=True),
+        # Matches the keyset pagination order of the suppression listing.
+        Index("ix_suppressed_emails_tenant_created", tenant_id, created_at.desc(), id.desc()),
+    )
+
     tenant = relationship("Tenant", back_populates="suppressed_emails")
+
+    @validates("email")
+    def _normalize_email(self, key: str, value: str) -> str:
+        return _lower_email(value)
@@ -1,29 +1,94 @@
 """SQLAlchemy session handling utilities."""
 from __future__ import annotations
 
+import json
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import make_url
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, raiseload, sessionmaker
 
 from src.core.config import settings
 
+try:  # pragma: no cover - optional dependency import
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _make_connect_args(url: str) -> dict:
+    """Return DBAPI connect arguments for the configured driver."""
+
+    db_url = make_url(url)
+    connect_args: dict = {}
+    if db_url.drivername.startswith("sqlite"):
+        # Sessions are shared with FastAPI's threadpool; create the database directory on first run.
+        connect_args["check_same_thread"] = False
+        if db_url.database and db_url.database != ":memory:":
+            Path(db_url.database).parent.mkdir(parents=True, exist_ok=True)
+    elif db_url.drivername.startswith("postgresql+psycopg"):
+        connect_args["sslmode"] = "require"
+        # Let psycopg server-side prepare statements after a few repeated executions; transaction-mode
+        # PgBouncer can hand each transaction a different server, so prepares are disabled behind it.
+        connect_args["prepare_threshold"] = None if settings.database_pgbouncer else 5
+        # Identifies this service's sessions in pg_stat_activity.
+        connect_args["application_name"] = settings.app_name
+    return connect_args
+
+
 # The engine is created once and reused for all requests.
-db_url = make_url(settings.database_url)
-connect_args = {}
-if db_url.drivername.startswith("postgresql+psycopg"):
-    connect_args["sslmode"] = "require"
+connect_args = _make_connect_args(settings.database_url)
 
+# Sized for bursts such as SNS fan-out and per-job worker sessions. No pre-ping: recycling before
+# typical NAT/RDS idle timeouts avoids a SELECT 1 per checkout, and LIFO keeps the warmest connections busy.
 engine = create_engine(
     settings.database_url,
     future=True,
-    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    connect_args=connect_args,
+)
+# expire_on_commit=False: handlers serialize objects after commit; don't re-SELECT them to do it.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for handlers declared with ``async def`` so they never block the event loop.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=20,
+    max_overflow=0,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
     connect_args=connect_args,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_strict_raiseload(state) -> None:
+    """Add raiseload("*") to SELECTs run with ``raiseload_strict=True`` so lazy loads fail loudly.
+
+    Listening on ``Session`` covers async sessions too, which delegate to a sync Session.
+    """
+
+    if state.is_select and not state.is_relationship_load and state.execution_options.get("raiseload_strict"):
+        state.statement = state.statement.options(raiseload("*"))
 
 
 def get_db() -> Iterator[Session]:
@@ -36,6 +101,13 @@ def get_db() -> Iterator[Session]:
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency that yields an async session."""
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 @contextmanager
 def session_scope() -> Iterator[Session]:
     """Context manager for scripts/CLI tools."""
@@ -0,0 +1,23 @@
+"""Dialect-aware INSERT ... ON CONFLICT helpers."""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_ignore_conflicts(db: Session, model, index_elements: Sequence[str], index_where: Any = None):
+    """Build an INSERT for ``model`` that silently skips rows clashing on ``index_elements``.
+
+    Pass ``index_where`` to target a partial unique index.
+    """
+
+    dialect = db.get_bind().dialect.name
+    try:
+        insert = _INSERTS[dialect]
+    except KeyError:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}") from None
+    return insert(model).on_conflict_do_nothing(index_elements=list(index_elements), index_where=index_where)
@@ -2,22 +2,54 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 
 
+@lru_cache(maxsize=32)
 def api_url(base_url: str, path: str) -> str:
     base = base_url.rstrip("/")
     suffix = path if path.startswith("/") else f"/{path}"
     return f"{base}{suffix}"
 
 
+@st.cache_resource
+def _http() -> requests.Session:
+    """Shared keep-alive session so clicks reuse pooled connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data
+def _default_api_base() -> str:
+    return os.getenv("API_BASE_URL", "http://127.0.0.1:8000").strip()
+
+
 def _resolve_api_base() -> str:
     override = st.session_state.get("api_base_override", "").strip()
     if override:
         return override
-    return os.getenv("API_BASE_URL", "http://127.0.0.1:8000").strip()
+    return _default_api_base()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _probe(api_base: str) -> tuple[bool, str, str]:
+    """Return (ok, summary, body) for the API health check, cached briefly across reruns."""
+    try:
+        response = _http().get(api_url(api_base, "/health"), timeout=10)
+        if response.status_code == 404:
+            response = _http().get(api_url(api_base, "/api/health"), timeout=10)
+    except requests.RequestException as exc:
+        return False, f"API check failed: {exc}", ""
+    if response.ok:
+        return True, f"API OK ({response.status_code})", ""
+    return False, f"API check failed ({response.status_code})", response.text
 
 
 def main() -> None:
@@ -36,17 +68,13 @@ def main() -> None:
         )
         st.caption(f"Resolved API base: {api_base}")
         if st.button("Test API"):
-            try:
-                response = requests.get(api_url(api_base, "/health"), timeout=10)
-                if response.status_code == 404:
-                    response = requests.get(api_url(api_base, "/api/health"), timeout=10)
-                if response.ok:
-                    st.success(f"API OK ({response.status_code})")
-                else:
-                    st.error(f"API check failed ({response.status_code})")
-                    st.text(response.text)
-            except requests.RequestException as exc:
-                st.error(f"API check failed: {exc}")
+            ok, summary, body = _probe(api_base)
+            if ok:
+                st.success(summary)
+            else:
+                st.error(summary)
+                if body:
+                    st.text(body)
 
     to_email = st.text_input("To", value="success@simulator.amazonses.com")
     subject = st.text_input("Subject", value="UI test")
@@ -65,7 +93,7 @@ def main() -> None:
             "enqueue": enqueue,
         }
         try:
-            response = requests.post(api_url(api_base, "/send/send-test"), json=payload, timeout=10)
+            response = _http().post(api_url(api_base, "/send/send-test"), json=payload, timeout=10)
         except requests.RequestException as exc:
             st.error(f"Request failed: {exc}")
             return
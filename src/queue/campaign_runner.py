@@ -1,42 +1,123 @@
 """Utilities to dispatch campaign emails to the queue."""
 from __future__ import annotations
 
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from src.db.session import session_scope
+from src.core.config import settings
+from src.db.session import engine, session_scope
 from src.queue.worker import _get_queue, enqueue_email_job
 from src.services import campaign_service
+from src.services.ses import campaign_template_name, ses_service
 from src.utils.logger import logger
 
 
+# Secondary email_logs indexes that are only needed for lookups, not for the send itself.
+# ix_email_logs_message_id stays in place because SNS callbacks query it mid-send.
+_DEFERRABLE_LOG_INDEXES = (
+    ("ix_email_logs_recipient_email", "recipient_email"),
+    ("ix_email_logs_provider_job_id", "provider_job_id"),
+)
+
+
 def _get_campaign(db: Session, campaign_id: int):
     return campaign_service.validate_campaign(db, campaign_id)
 
 
+# Session-level advisory lock serializing index drop/rebuild across concurrent large campaigns.
+_DEFER_INDEX_LOCK_KEY = 0x656D61696C6C6F67
+_INVALID_INDEXES = text(
+    "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE c.relname = ANY(:names) AND NOT i.indisvalid"
+)
+
+
+def _rebuild_log_indexes(conn) -> None:
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index that IF NOT EXISTS would keep skipping.
+    names = [name for name, _ in _DEFERRABLE_LOG_INDEXES]
+    for name in conn.execute(_INVALID_INDEXES, {"names": names}).scalars():
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    for name, column in _DEFERRABLE_LOG_INDEXES:
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON email_logs ({column})"))
+    logger.info("Rebuilt deferred email_logs indexes")
+
+
+def _defers_log_indexes() -> bool:
+    return engine.dialect.name == "postgresql" and settings.campaign_defer_index_threshold > 0
+
+
+@contextmanager
+def deferred_log_indexes(db: Session, tenant_id: int) -> Iterator[None]:
+    """Drop lookup indexes on email_logs around a large send and rebuild them afterwards.
+
+    Only applies on PostgreSQL when `campaign_defer_index_threshold` is set and the tenant's
+    recipient count reaches it; the count is skipped otherwise. CONCURRENTLY keeps other tenants'
+    reads and writes unblocked.
+    Callers must commit their inserts before leaving the block; on error ``db`` is rolled back
+    and closed first, since CREATE INDEX CONCURRENTLY waits for its open transaction.
+    """
+
+    if not _defers_log_indexes():
+        yield
+        return
+    recipient_count = campaign_service.count_recipients(db, tenant_id)
+    if recipient_count < settings.campaign_defer_index_threshold:
+        yield
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _DEFER_INDEX_LOCK_KEY})
+        try:
+            for name, _ in _DEFERRABLE_LOG_INDEXES:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            logger.info("Deferred email_logs indexes for a %s recipient send", recipient_count)
+            try:
+                yield
+            except BaseException:
+                db.rollback()
+                db.close()
+                raise
+            finally:
+                _rebuild_log_indexes(conn)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _DEFER_INDEX_LOCK_KEY})
+
+
+def _send_campaign(db: Session, campaign_id: int) -> int:
+    campaign = _get_campaign(db, campaign_id)
+    campaign_service.update_campaign_status(db, campaign.id, "sending")
+    with deferred_log_indexes(db, campaign.tenant_id):
+        subscribers = campaign_service.load_recipients(db, campaign.tenant_id)
+        enqueued = campaign_service.enqueue_bulk_emails(db, campaign, subscribers)
+        # CREATE INDEX CONCURRENTLY waits on open writers, so release our rows first.
+        db.commit()
+    campaign_service.update_campaign_status(db, campaign.id, "completed")
+    # Every job of this run sends the current version; earlier versions only cost template quota now.
+    ses_service.delete_campaign_templates(
+        campaign.id, keep=campaign_template_name(campaign.id, campaign.subject, campaign.body)
+    )
+    return enqueued
+
+
 def run_campaign(campaign_id: int) -> int:
     """Enqueue emails for all subscribers of a campaign's tenant synchronously."""
 
     with session_scope() as db:
-        campaign = _get_campaign(db, campaign_id)
-        campaign_service.update_campaign_status(db, campaign.id, "sending")
-        subscribers = campaign_service.load_recipients(db, campaign.tenant_id)
-        enqueued = campaign_service.enqueue_bulk_emails(db, campaign, subscribers)
-        campaign_service.update_campaign_status(db, campaign.id, "completed")
-        logger.info("Campaign %s enqueued %s emails", campaign.id, enqueued)
-        return enqueued
+        enqueued = _send_campaign(db, campaign_id)
+    logger.info("Campaign %s enqueued %s emails", campaign_id, enqueued)
+    return enqueued
 
 
 def _run_campaign_job(campaign_id: int) -> int:
     """RQ-friendly job to process a campaign."""
 
     with session_scope() as db:
-        campaign = _get_campaign(db, campaign_id)
-        campaign_service.update_campaign_status(db, campaign.id, "sending")
-        subscribers = campaign_service.load_recipients(db, campaign.tenant_id)
-        enqueued = campaign_service.enqueue_bulk_emails(db, campaign, subscribers)
-        campaign_service.update_campaign_status(db, campaign.id, "completed")
-        logger.info("Campaign job %s enqueued %s emails", campaign.id, enqueued)
-        return enqueued
+        enqueued = _send_campaign(db, campaign_id)
+    logger.info("Campaign job %s enqueued %s emails", campaign_id, enqueued)
+    return enqueued
 
 
 def enqueue_campaign_run(campaign_id: int):
@@ -1,10 +1,14 @@
 """RQ worker that delivers outbound emails via SES."""
 from __future__ import annotations
 
+import atexit
 import os
 import sys
-from datetime import datetime, timezone
-from typing import Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque
 
 try:  # pragma: no cover - optional dependency import
     import redis  # type: ignore
@@ -12,14 +16,19 @@ except ImportError:  # pragma: no cover
     redis = None  # type: ignore
 
 try:  # pragma: no cover
-    from rq import Connection, Queue, Worker  # type: ignore
+    from rq import Connection, Queue, SimpleWorker, Worker  # type: ignore
 except ImportError:  # pragma: no cover
-    Connection = Queue = Worker = None  # type: ignore
+    Connection = Queue = SimpleWorker = Worker = None  # type: ignore
+
+from cachetools import TTLCache
+from sqlalchemy import bindparam, select, update
 
 from src.core.config import settings
 from src.db import models
 from src.db.session import session_scope
-from src.services.ses import SESService
+from src.services.ses import BULK_DESTINATIONS_MAX, campaign_content_digest, ses_service
+from src.services.template_engine import warm_templates
+from src.utils.datetime import utcnow_batch
 from src.utils.logger import logger
 
 _email_queue: Any | None = None
@@ -37,40 +46,160 @@ def _get_queue() -> Any:
     if _email_queue is None:
         _ensure_dependencies()
         connection = redis.Redis.from_url(settings.redis_url)  # type: ignore[union-attr]
-        _email_queue = Queue("emails", connection=connection)  # type: ignore[call-arg]
+        _email_queue = Queue(settings.rq_queue_name, connection=connection)  # type: ignore[call-arg]
     return _email_queue
 
 
-def _mark_log_sent(email_log_id: int, message_id: str) -> None:
-    with session_scope() as db:
-        log = db.query(models.EmailLog).filter(models.EmailLog.id == email_log_id).first()
-        if not log:
-            logger.warning("EmailLog not found for id=%s after send", email_log_id)
+# EmailLog status writes are buffered and flushed together, by size or after a short delay.
+LOG_FLUSH_SIZE = 100
+LOG_FLUSH_INTERVAL_SECONDS = 0.5
+LOG_FLUSH_MAX_ATTEMPTS = 3
+
+_email_logs = models.EmailLog.__table__
+# Core executemany statements: unlike the ORM bulk UPDATE they don't fail a batch over a missing row.
+_MARK_SENT = (
+    update(_email_logs)
+    .where(_email_logs.c.id == bindparam("b_id"))
+    .values(
+        message_id=bindparam("message_id"),
+        status="sent",
+        last_event_type="send",
+        last_event_at=bindparam("last_event_at"),
+    )
+)
+_MARK_FAILED = (
+    update(_email_logs)
+    .where(_email_logs.c.id == bindparam("b_id"))
+    .values(
+        status="failed",
+        last_event_type="send_failed",
+        last_event_at=bindparam("last_event_at"),
+        last_smtp_response=bindparam("last_smtp_response"),
+    )
+)
+
+# Set by run_worker when WORKER_IN_PROCESS runs every job in this process. The default forking rq worker
+# ends each job's work horse with os._exit, which skips atexit, so there each job flushes its own updates.
+_buffer_outlives_jobs = False
+
+# (statement, params, failed write attempts so far)
+_pending_log_updates: Deque[tuple[Any, dict[str, Any], int]] = deque()
+_pending_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+
+
+def _arm_flush_timer() -> None:
+    # Caller holds _pending_lock.
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(LOG_FLUSH_INTERVAL_SECONDS, flush_log_updates)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _take_pending() -> list[tuple[Any, dict[str, Any], int]]:
+    # Caller holds _pending_lock.
+    global _flush_timer
+    rows = list(_pending_log_updates)
+    _pending_log_updates.clear()
+    if _flush_timer is not None:
+        _flush_timer.cancel()
+        _flush_timer = None
+    return rows
+
+
+def _write_log_updates(rows: list[tuple[Any, dict[str, Any], int]]) -> None:
+    # One clock read per flush; every row in the batch is stamped with it.
+    now = utcnow_batch()
+    try:
+        with session_scope() as db:
+            for stmt in (_MARK_SENT, _MARK_FAILED):
+                params = [{**row, "last_event_at": now} for row_stmt, row, _ in rows if row_stmt is stmt]
+                if params:
+                    matched = db.execute(stmt, params).rowcount
+                    if 0 <= matched < len(params):
+                        logger.warning(
+                            "Status update matched %s of %s email logs; the rest do not exist",
+                            matched,
+                            len(params),
+                        )
+    except Exception:
+        # Put the batch back for the next flush; only give up on a row after LOG_FLUSH_MAX_ATTEMPTS.
+        retry = [(stmt, row, attempts + 1) for stmt, row, attempts in rows if attempts + 1 < LOG_FLUSH_MAX_ATTEMPTS]
+        dropped = [row["b_id"] for _, row, attempts in rows if attempts + 1 >= LOG_FLUSH_MAX_ATTEMPTS]
+        logger.exception("Failed to write status for %s email logs; %s will be retried", len(rows), len(retry))
+        if dropped:
+            logger.error("Dropped status updates for email logs %s after %s attempts", dropped, LOG_FLUSH_MAX_ATTEMPTS)
+        if retry:
+            with _pending_lock:
+                _pending_log_updates.extendleft(reversed(retry))
+                _arm_flush_timer()
+
+
+def flush_log_updates() -> None:
+    """Write every buffered EmailLog status update now; a failed batch stays buffered for a retry."""
+
+    with _pending_lock:
+        rows = _take_pending()
+    if rows:
+        _write_log_updates(rows)
+
+
+def _flush_until_empty() -> None:
+    # Shutdown path: no timer will run later, so retry here until the buffer drains or rows are dropped.
+    for attempt in range(LOG_FLUSH_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(LOG_FLUSH_INTERVAL_SECONDS)
+        flush_log_updates()
+        if not _pending_log_updates:
             return
-        log.message_id = message_id
-        log.status = "sent"
-        log.last_event_type = "send"
-        log.last_event_at = datetime.now(timezone.utc)
-        db.add(log)
+
+
+def _queue_log_update(stmt: Any, row: dict[str, Any]) -> None:
+    rows = None
+    with _pending_lock:
+        _pending_log_updates.append((stmt, row, 0))
+        if len(_pending_log_updates) >= LOG_FLUSH_SIZE:
+            rows = _take_pending()
+        else:
+            _arm_flush_timer()
+    if rows:
+        _write_log_updates(rows)
+
+
+atexit.register(_flush_until_empty)
+
+
+def _flush_on_exception(job, exc_type, exc_value, traceback) -> bool:  # noqa: ARG001
+    flush_log_updates()
+    return True
+
+
+def _flush_after_job() -> None:
+    if not _buffer_outlives_jobs:
+        _flush_until_empty()
+
+
+def _mark_log_sent(email_log_id: int, message_id: str) -> None:
+    _queue_log_update(
+        _MARK_SENT,
+        {"b_id": email_log_id, "message_id": message_id},
+    )
+
 
 def _mark_log_failed(email_log_id: int, error_message: str) -> None:
-    with session_scope() as db:
-        log = db.query(models.EmailLog).filter(models.EmailLog.id == email_log_id).first()
-        if not log:
-            logger.warning("EmailLog not found for id=%s after failure", email_log_id)
-            return
-        log.status = "failed"
-        log.last_event_type = "send_failed"
-        log.last_event_at = datetime.now(timezone.utc)
-        log.last_smtp_response = error_message[:1024]
-        db.add(log)
+    _queue_log_update(
+        _MARK_FAILED,
+        {"b_id": email_log_id, "last_smtp_response": error_message[:1024]},
+    )
+
 
 def process_email_job(*, subject: str, recipient: str, body: str, email_log_id: int | None = None) -> str:
     """Background job that sends an email."""
 
-    service = SESService()
     try:
-        message_id = service.send_email(subject=subject, recipient=recipient, text_body=body)
+        # The module-level service keeps one boto3 client (and its connection pool) across jobs.
+        message_id = ses_service.send_email(subject=subject, recipient=recipient, text_body=body)
         if email_log_id is not None:
             _mark_log_sent(email_log_id, message_id)
         logger.info("Processed queued email to %s", recipient)
@@ -79,21 +208,157 @@ def process_email_job(*, subject: str, recipient: str, body: str, email_log_id:
         if email_log_id is not None:
             _mark_log_failed(email_log_id, str(exc))
         raise
+    finally:
+        _flush_after_job()
 
 
-def enqueue_email_job(*, subject: str, recipient: str, body: str, email_log_id: int | None = None):
-    """Helper for API routes to enqueue jobs."""
+def enqueue_email_job(
+    *,
+    subject: str,
+    recipient: str,
+    body: str,
+    email_log_id: int | None = None,
+    job_id: str | None = None,
+):
+    """Helper for API routes to enqueue jobs.
+
+    Pass ``job_id`` to use an id reserved up front (e.g. already stored as ``provider_job_id``).
+    """
 
     queue = _get_queue()
     return queue.enqueue(
         process_email_job,
         kwargs={"subject": subject, "recipient": recipient, "body": body, "email_log_id": email_log_id},
+        job_id=job_id,
     )
 
 
+# Jobs carry only a digest of the campaign content they were enqueued for; each worker process
+# reads the content once per (campaign, digest), so an edit followed by a re-send is picked up.
+_CAMPAIGN_CONTENT = select(models.Campaign.subject, models.Campaign.body).where(
+    models.Campaign.id == bindparam("campaign_id")
+)
+_campaign_contents: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_campaign_contents_lock = threading.Lock()
+
+
+def _get_campaign_content(campaign_id: int, content_digest: str | None) -> tuple[str, str]:
+    key = (campaign_id, content_digest)
+    with _campaign_contents_lock:
+        content = _campaign_contents.get(key) if content_digest else None
+    if content is None:
+        with session_scope() as db:
+            row = db.execute(_CAMPAIGN_CONTENT, {"campaign_id": campaign_id}).one_or_none()
+        if row is None:
+            raise LookupError(f"Campaign {campaign_id} not found")
+        content = (row.subject, row.body)
+        # Cache under the digest of what was read, which differs if the campaign was edited after enqueue.
+        with _campaign_contents_lock:
+            _campaign_contents[(campaign_id, campaign_content_digest(*content))] = content
+    return content
+
+
+_send_executor: ThreadPoolExecutor | None = None
+
+
+def _get_send_executor() -> ThreadPoolExecutor:
+    # SES calls are network-bound; the shared boto3 client is thread-safe and pools its connections.
+    global _send_executor
+    if _send_executor is None:
+        _send_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.ses_max_concurrency), thread_name_prefix="ses-send"
+        )
+    return _send_executor
+
+
+def _send_bulk_chunk(template_name: str, recipients: list[tuple[int, str]]) -> int:
+    try:
+        results = ses_service.send_bulk_email(
+            template_name=template_name, recipients=[email for _, email in recipients]
+        )
+    except Exception as exc:
+        for email_log_id, _ in recipients:
+            _mark_log_failed(email_log_id, str(exc))
+        raise
+    sent = 0
+    for (email_log_id, _), (message_id, error) in zip(recipients, results):
+        if message_id:
+            _mark_log_sent(email_log_id, message_id)
+            sent += 1
+        else:
+            _mark_log_failed(email_log_id, error or "rejected by SES")
+    return sent
+
+
+def process_bulk_email_job(
+    *, campaign_id: int, recipients: list[tuple[int, str]], content_digest: str | None = None
+) -> int:
+    """Background job that sends one campaign message to ``(email_log_id, email)`` recipients.
+
+    Recipients are split into SES bulk calls of ``BULK_DESTINATIONS_MAX``, which run concurrently
+    (up to ``settings.ses_max_concurrency``). Raises the first failure after every call has finished.
+    """
+
+    try:
+        return _send_bulk_job(campaign_id, recipients, content_digest)
+    finally:
+        _flush_after_job()
+
+
+def _send_bulk_job(campaign_id: int, recipients: list[tuple[int, str]], content_digest: str | None) -> int:
+    try:
+        subject, body = _get_campaign_content(campaign_id, content_digest)
+        template_name = ses_service.ensure_campaign_template(campaign_id, subject=subject, text_body=body)
+    except Exception as exc:
+        for email_log_id, _ in recipients:
+            _mark_log_failed(email_log_id, str(exc))
+        raise
+    chunks = [
+        recipients[start : start + BULK_DESTINATIONS_MAX] for start in range(0, len(recipients), BULK_DESTINATIONS_MAX)
+    ]
+    if len(chunks) == 1:
+        sent = _send_bulk_chunk(template_name, chunks[0])
+    else:
+        executor = _get_send_executor()
+        futures = [executor.submit(_send_bulk_chunk, template_name, chunk) for chunk in chunks]
+        # Wait for every chunk so each one's logs are marked before a failure fails the job.
+        errors = [exc for exc in (future.exception() for future in futures) if exc is not None]
+        if errors:
+            raise errors[0]
+        sent = sum(future.result() for future in futures)
+    logger.info("Processed bulk send for campaign %s: %s/%s sent", campaign_id, sent, len(recipients))
+    return sent
+
+
+def enqueue_bulk_email_jobs(jobs: list[dict[str, Any]]) -> list:
+    """Enqueue many bulk send jobs through a single Redis pipeline.
+
+    Each item takes the keyword arguments of :func:`process_bulk_email_job` plus an optional ``job_id``.
+    """
+
+    queue = _get_queue()
+    job_datas = [
+        Queue.prepare_data(
+            process_bulk_email_job,
+            kwargs={
+                "campaign_id": job["campaign_id"],
+                "recipients": job["recipients"],
+                "content_digest": job.get("content_digest"),
+            },
+            job_id=job.get("job_id"),
+        )
+        for job in jobs
+    ]
+    with queue.connection.pipeline() as pipe:
+        enqueued = queue.enqueue_many(job_datas, pipeline=pipe)
+        pipe.execute()
+    return enqueued
+
+
 def run_worker() -> None:
     """Entry point called by `python -m src.queue.worker`."""
 
+    global _buffer_outlives_jobs
     if (
         settings.environment == "development"
         and sys.platform == "darwin"
@@ -105,11 +370,20 @@ def run_worker() -> None:
         )
         os.environ["OBJC_DISABLE_INITIALIZE_FORK_SAFETY"] = "YES"
 
+    logger.info("Warmed %s email templates", warm_templates())
     queue = _get_queue()
     connection = queue.connection
     with Connection(connection):  # type: ignore[arg-type]
-        worker = Worker([queue])
-        worker.work(with_scheduler=True)
+        if settings.worker_in_process:
+            # No fork per job: buffered status writes outlive each job, at the cost of process isolation.
+            worker = SimpleWorker([queue], exception_handlers=[_flush_on_exception])
+            _buffer_outlives_jobs = True
+        else:
+            worker = Worker([queue], exception_handlers=[_flush_on_exception])
+        try:
+            worker.work(with_scheduler=True)
+        finally:
+            _flush_until_empty()
 
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
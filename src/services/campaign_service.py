@@ -1,65 +1,128 @@
 """Helpers for campaign validation and bulk email enqueuing."""
 from __future__ import annotations
 
-from typing import Iterable
+from itertools import islice
+from typing import Iterable, Iterator
+from uuid import uuid4
 
+from sqlalchemy import Row, and_, bindparam, func, insert, select
 from sqlalchemy.orm import Session
 
 from src.db import models
-from src.queue.worker import enqueue_email_job
+from src.queue.worker import enqueue_bulk_email_jobs
+from src.services.ses import BULK_DESTINATIONS_MAX, campaign_content_digest
 from src.utils.logger import logger
 
+# Rows fetched per round trip when streaming recipients, and EmailLog rows inserted per statement.
+RECIPIENT_BATCH_SIZE = 1000
+# Recipients per send job; the worker splits each job into concurrent SES bulk calls.
+SEND_BATCH_SIZE = 4 * BULK_DESTINATIONS_MAX
+
 
 def validate_campaign(db: Session, campaign_id: int) -> models.Campaign:
-    campaign = db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
+    # Session.get answers from the identity map when the campaign is already loaded.
+    campaign = db.get(models.Campaign, campaign_id)
     if campaign is None:
         raise ValueError("Campaign not found")
     return campaign
 
 
-def load_recipients(db: Session, tenant_id: int) -> list[models.Subscriber]:
-    suppressed = (
-        db.query(models.SuppressedEmail.email)
-        .filter(models.SuppressedEmail.tenant_id == tenant_id)
-        .subquery()
+def _with_recipients_filter(stmt, tenant_id: int):
+    # LEFT JOIN ... IS NULL anti-join on the (tenant_id, email) suppression index.
+    return stmt.outerjoin(
+        models.SuppressedEmail,
+        and_(
+            models.SuppressedEmail.tenant_id == models.Subscriber.tenant_id,
+            models.SuppressedEmail.email == models.Subscriber.email,
+        ),
+    ).where(
+        models.Subscriber.tenant_id == tenant_id,
+        models.Subscriber.status == "active",
+        models.SuppressedEmail.id.is_(None),
     )
-    recipients = (
-        db.query(models.Subscriber)
-        .filter(
-            models.Subscriber.tenant_id == tenant_id,
-            models.Subscriber.status == "active",
-            ~models.Subscriber.email.in_(suppressed),
-        )
-        .all()
+
+
+def count_recipients(db: Session, tenant_id: int) -> int:
+    stmt = _with_recipients_filter(select(func.count()).select_from(models.Subscriber), tenant_id)
+    return db.execute(stmt).scalar_one()
+
+
+def load_recipients(db: Session, tenant_id: int) -> Iterator[Row]:
+    """Yield (id, email) rows for the tenant's deliverable subscribers.
+
+    Rows are fetched in keyset pages of ``RECIPIENT_BATCH_SIZE`` on (tenant_id, status, id), so
+    memory stays bounded and callers may commit ``db`` between pages without losing a cursor.
+    """
+
+    stmt = (
+        _with_recipients_filter(select(models.Subscriber.id, models.Subscriber.email), tenant_id)
+        .where(models.Subscriber.id > bindparam("after_id"))
+        .order_by(models.Subscriber.id)
+        .limit(bindparam("page_size"))
     )
-    return recipients
+    after_id = 0
+    while True:
+        rows = db.execute(stmt, {"after_id": after_id, "page_size": RECIPIENT_BATCH_SIZE}).all()
+        yield from rows
+        if len(rows) < RECIPIENT_BATCH_SIZE:
+            return
+        after_id = rows[-1].id
+
 
+def enqueue_bulk_emails(db: Session, campaign: models.Campaign, subscribers: Iterable) -> int:
+    """Insert one EmailLog per recipient and enqueue bulk send jobs, a batch at a time.
 
-def enqueue_bulk_emails(db: Session, campaign: models.Campaign, subscribers: Iterable[models.Subscriber]) -> int:
+    ``subscribers`` may be Subscriber objects or ``(id, email)`` rows from :func:`load_recipients`.
+    Each job covers up to ``SEND_BATCH_SIZE`` recipients; RQ job ids are reserved before the insert,
+    so each batch is one INSERT and one Redis pipeline. Each batch is committed before its jobs are
+    enqueued, so a worker never sees a log id whose row is not yet visible.
+    """
+
+    # Read once: the per-batch commits would otherwise expire and reload them.
+    campaign_id, tenant_id = campaign.id, campaign.tenant_id
+    content_digest = campaign_content_digest(campaign.subject, campaign.body)
+    insert_logs = insert(models.EmailLog).returning(models.EmailLog.id, sort_by_parameter_order=True)
     enqueued = 0
-    for subscriber in subscribers:
-        email_log = models.EmailLog(
-            tenant_id=campaign.tenant_id,
-            campaign_id=campaign.id,
-            subscriber_id=subscriber.id,
-            status="queued",
-            recipient_email=subscriber.email,
-        )
-        db.add(email_log)
-        db.flush()
-        job = enqueue_email_job(
-            subject=campaign.subject,
-            recipient=subscriber.email,
-            body=campaign.body,
-            email_log_id=email_log.id,
+    recipients = iter(subscribers)
+    while batch := list(islice(recipients, RECIPIENT_BATCH_SIZE)):
+        starts = range(0, len(batch), SEND_BATCH_SIZE)
+        job_ids = [uuid4().hex for _ in starts]
+        log_ids = db.execute(
+            insert_logs,
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "campaign_id": campaign_id,
+                    "subscriber_id": subscriber.id,
+                    "status": "queued",
+                    "recipient_email": subscriber.email,
+                    "provider_job_id": job_ids[position // SEND_BATCH_SIZE],
+                }
+                for position, subscriber in enumerate(batch)
+            ],
+        ).scalars().all()
+        db.commit()
+        enqueue_bulk_email_jobs(
+            [
+                {
+                    "campaign_id": campaign_id,
+                    "content_digest": content_digest,
+                    "recipients": [
+                        (email_log_id, subscriber.email)
+                        for subscriber, email_log_id in zip(
+                            batch[start : start + SEND_BATCH_SIZE], log_ids[start : start + SEND_BATCH_SIZE]
+                        )
+                    ],
+                    "job_id": job_id,
+                }
+                for start, job_id in zip(starts, job_ids)
+            ]
         )
-        email_log.provider_job_id = job.id
-        enqueued += 1
-    logger.info("Campaign %s enqueued %s messages", campaign.id, enqueued)
+        enqueued += len(batch)
+    logger.info("Campaign %s enqueued %s messages", campaign_id, enqueued)
     return enqueued
 
 
 def update_campaign_status(db: Session, campaign_id: int, status: str) -> None:
     campaign = validate_campaign(db, campaign_id)
     campaign.status = status
-    db.add(campaign)
@@ -1,13 +1,16 @@
 """AWS SES helper functions."""
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+from typing import Optional, Sequence
 
 try:  # pragma: no cover - optional dependency import
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import BotoCoreError, ClientError
 except ImportError:  # pragma: no cover
     boto3 = None  # type: ignore
+    Config = None  # type: ignore
 
     class BotoCoreError(Exception):
         """Fallback exception when botocore is unavailable."""
@@ -18,6 +21,40 @@ except ImportError:  # pragma: no cover
 from src.core.config import settings
 from src.utils.logger import logger
 
+# One client is shared by every send in a process, so keep a warm connection pool and retry throttling adaptively.
+_CLIENT_CONFIG = (
+    Config(
+        max_pool_connections=64,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        tcp_keepalive=True,
+        connect_timeout=2,
+        read_timeout=10,
+    )
+    if Config is not None
+    else None
+)
+_SOURCE = "dhanesh@silverseven.com"
+# SendBulkTemplatedEmail accepts at most 50 destinations per call.
+BULK_DESTINATIONS_MAX = 50
+
+
+def campaign_content_digest(subject: str, body: str) -> str:
+    """Short hash identifying one version of a campaign's subject and body."""
+
+    return hashlib.sha256(f"{subject}\0{body}".encode("utf-8")).hexdigest()[:16]
+
+
+def campaign_template_name(campaign_id: int, subject: str, body: str) -> str:
+    """SES template name for one version of a campaign's content."""
+
+    return f"campaign-{campaign_id}-{campaign_content_digest(subject, body)}"
+
+
+def _escape_template_text(text: str) -> str:
+    """Escape ``{{`` so SES renders campaign text literally instead of as Handlebars."""
+
+    return text.replace("{{", "\\{{")
+
 
 class SESService:
     """Encapsulates the boto3 SES client."""
@@ -32,6 +69,8 @@ class SESService:
         self.aws_secret_access_key = aws_secret_access_key or settings.aws_secret_access_key
         self.region_name = region_name or settings.aws_region_name or "ap-southeast-2"
         self._client = None
+        # Registered templates by name, kept so one deleted under a running job can be re-created.
+        self._templates: dict[str, dict[str, str]] = {}
 
     def _client_or_raise(self):
         if self._client is None:
@@ -40,7 +79,7 @@ class SESService:
             if not self.region_name:
                 raise RuntimeError("AWS region is required for SES. Set AWS_REGION_NAME in the environment.")
 
-            client_kwargs = {"region_name": self.region_name}
+            client_kwargs = {"region_name": self.region_name, "config": _CLIENT_CONFIG}
             if self.aws_access_key_id and self.aws_secret_access_key:
                 client_kwargs["aws_access_key_id"] = self.aws_access_key_id
                 client_kwargs["aws_secret_access_key"] = self.aws_secret_access_key
@@ -62,7 +101,7 @@ class SESService:
         client = self._client_or_raise()
         try:
             request = {
-                "Source": "dhanesh@silverseven.com",
+                "Source": _SOURCE,
                 "Destination": {"ToAddresses": [recipient]},
                 "Message": {
                     "Subject": {"Data": subject},
@@ -83,5 +122,121 @@ class SESService:
         logger.info("SES send_email message_id=%s", message_id)
         return message_id
 
+    def ensure_template(self, name: str, *, subject: str, text_body: str, html_body: Optional[str] = None) -> None:
+        """Create or refresh an SES template, once per process per name.
+
+        The parts are literal text; ``{{`` is escaped before registering. Callers that change content
+        must change ``name`` too (see :meth:`ensure_campaign_template`).
+        """
+
+        if name in self._templates:
+            return
+        client = self._client_or_raise()
+        template = {
+            "TemplateName": name,
+            "SubjectPart": _escape_template_text(subject),
+            "TextPart": _escape_template_text(text_body),
+            "HtmlPart": _escape_template_text(html_body or text_body),
+        }
+        self._register_template(client, template)
+
+    def _register_template(self, client, template: dict[str, str]) -> None:
+        try:
+            try:
+                client.create_template(Template=template)
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") != "AlreadyExists":
+                    raise
+                client.update_template(Template=template)
+        except (BotoCoreError, ClientError) as exc:  # pragma: no cover - network service
+            logger.exception("Failed to register SES template %s", template["TemplateName"])
+            raise RuntimeError("SES create_template failed") from exc
+        self._templates[template["TemplateName"]] = template
+
+    def ensure_campaign_template(self, campaign_id: int, *, subject: str, text_body: str) -> str:
+        """Register the campaign's current content and return its template name.
+
+        The name carries a hash of the content, so an edited campaign gets a new template and every
+        worker sends the same version. Superseded versions are left for :meth:`delete_campaign_templates`
+        once the campaign run is finished, since queued jobs may still send them.
+        """
+
+        name = campaign_template_name(campaign_id, subject, text_body)
+        self.ensure_template(name, subject=subject, text_body=text_body)
+        return name
+
+    def delete_campaign_templates(self, campaign_id: int, *, keep: str | None = None) -> int:
+        """Delete the campaign's SES templates other than ``keep``; returns how many were deleted.
+
+        Best effort: failures are logged, since a leftover template only costs quota.
+        """
+
+        prefix = f"campaign-{campaign_id}-"
+        deleted = 0
+        try:
+            client = self._client_or_raise()
+            stale: list[str] = []
+            request: dict = {"MaxItems": 100}
+            while True:
+                response = client.list_templates(**request)
+                stale.extend(
+                    template["Name"]
+                    for template in response.get("TemplatesMetadata", [])
+                    if template["Name"].startswith(prefix) and template["Name"] != keep
+                )
+                if not response.get("NextToken"):
+                    break
+                request["NextToken"] = response["NextToken"]
+            for name in stale:
+                client.delete_template(TemplateName=name)
+                self._templates.pop(name, None)
+                deleted += 1
+        except (BotoCoreError, ClientError, RuntimeError):  # pragma: no cover - network service
+            logger.exception("Failed to clean up SES templates for campaign %s", campaign_id)
+        return deleted
+
+    def send_bulk_email(self, *, template_name: str, recipients: Sequence[str]) -> list[tuple[str | None, str | None]]:
+        """Send one templated message per recipient in a single call.
+
+        Returns ``(message_id, error)`` per recipient, in order; ``message_id`` is None where SES rejected it.
+        A template this process registered but another one deleted is re-created and the call retried once.
+        """
+
+        if len(recipients) > BULK_DESTINATIONS_MAX:
+            raise ValueError(f"At most {BULK_DESTINATIONS_MAX} recipients per bulk send")
+        client = self._client_or_raise()
+        request = {
+            "Source": _SOURCE,
+            "Template": template_name,
+            "DefaultTemplateData": "{}",
+            "Destinations": [{"Destination": {"ToAddresses": [recipient]}} for recipient in recipients],
+        }
+        if settings.ses_configuration_set:
+            request["ConfigurationSetName"] = settings.ses_configuration_set
+        try:
+            try:
+                response = client.send_bulk_templated_email(**request)
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") != "TemplateDoesNotExist":
+                    raise
+                template = self._templates.pop(template_name, None)
+                if template is None:
+                    raise
+                logger.warning("SES template %s was deleted; re-creating it", template_name)
+                self._register_template(client, template)
+                response = client.send_bulk_templated_email(**request)
+        except (BotoCoreError, ClientError) as exc:  # pragma: no cover - network service
+            logger.exception("Failed to send bulk email via SES")
+            raise RuntimeError("SES send_bulk_templated_email failed") from exc
+
+        results: list[tuple[str | None, str | None]] = []
+        for status in response.get("Status", []):
+            if status.get("Status") == "Success":
+                results.append((status.get("MessageId"), None))
+            else:
+                results.append((None, status.get("Error") or status.get("Status")))
+        logger.info("SES send_bulk_templated_email sent=%s", sum(1 for message_id, _ in results if message_id))
+        return results
+
 
 ses_service = SESService()
@@ -4,19 +4,53 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from src.core.config import settings
 
 TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "templates"
 TEMPLATE_DIR.mkdir(exist_ok=True)
 
+
+def _make_bytecode_cache() -> FileSystemBytecodeCache:
+    """Use ``TEMPLATE_CACHE_DIR`` when set (the Docker image pre-fills it), else a per-user temp dir."""
+
+    if settings.template_cache_dir:
+        cache_dir = Path(settings.template_cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(directory=str(cache_dir), pattern="%s.cache")
+    return FileSystemBytecodeCache()
+
+
+# Templates ship with the image, so skip the per-render stat() and reuse compiled bytecode across processes.
 _env = Environment(
     loader=FileSystemLoader(str(TEMPLATE_DIR)),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=False,
+    cache_size=400,
+    bytecode_cache=_make_bytecode_cache(),
 )
 
 
+def get_template(template_name: str) -> Template:
+    """Return the compiled template; hold on to it when rendering in a loop."""
+
+    return _env.get_template(template_name)
+
+
+def warm_templates() -> int:
+    """Compile every template up front so the first render doesn't pay for parsing."""
+
+    names = _env.list_templates()
+    for name in names:
+        _env.get_template(name)
+    return len(names)
+
+
 def render_template(template_name: str, **context: Any) -> str:
     """Render a template file with the provided context."""
 
-    template = _env.get_template(template_name)
-    return template.render(**context)
+    return get_template(template_name).render(**context)
+
+
+warm_templates()
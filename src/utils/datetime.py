@@ -1,9 +1,27 @@
 """Datetime utilities for timezone-aware UTC timestamps."""
 from __future__ import annotations
 
+import time
 from datetime import UTC, datetime
 
+_BATCH_WINDOW_NS = 1_000_000
+_batch_now: tuple[int, datetime] | None = None
+
 
 def utcnow() -> datetime:
     """Return the current UTC time as a timezone-aware datetime."""
     return datetime.now(UTC)
+
+
+def utcnow_batch() -> datetime:
+    """Return a UTC timestamp shared by every call within the same millisecond.
+
+    For stamping a batch of rows, where sub-millisecond differences between them don't matter.
+    """
+    global _batch_now
+    tick = time.monotonic_ns()
+    cached = _batch_now
+    if cached is None or tick - cached[0] >= _BATCH_WINDOW_NS:
+        cached = (tick, datetime.now(UTC))
+        _batch_now = cached
+    return cached[1]
@@ -1,8 +1,11 @@
 """Central logging configuration."""
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
 
 from src.core.config import settings
 
@@ -28,10 +31,45 @@ LOGGING_CONFIG = {
 }
 
 
+class _InProcessQueueHandler(QueueHandler):
+    """QueueHandler that enqueues the record untouched.
+
+    The stock ``prepare`` formats the message on the calling thread so the record can be pickled;
+    the listener here shares the process, so formatting is left to it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: QueueListener | None = None
+
+
 def configure_logging() -> None:
-    """Apply the logging configuration once at application startup."""
+    """Apply the logging configuration once at application startup.
+
+    Request threads only enqueue records; formatting and the console write happen on a listener thread.
+    """
 
+    global _listener
+    _stop_listener()
     dictConfig(LOGGING_CONFIG)
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.handlers = [_InProcessQueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(_stop_listener)
+    atexit.register(_stop_listener)
+
+
+def _stop_listener() -> None:
+    # Drains queued records; also runs at interpreter exit.
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 logger = logging.getLogger("email-delivery")
@@ -2,15 +2,32 @@
 from __future__ import annotations
 
 import base64
-import json
-import subprocess
-import tempfile
+import hashlib
+import re
+from functools import lru_cache
 from typing import Any
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
+from src.utils.datetime import utcnow
 from src.utils.logger import logger
 
+try:  # pragma: no cover - optional dependency import
+    from cryptography import x509
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
+except ImportError:  # pragma: no cover
+    x509 = None  # type: ignore
+
+    class InvalidSignature(Exception):  # type: ignore[no-redef]
+        """Fallback exception when cryptography is unavailable."""
+
+
+# sns.amazonaws.com or a regional endpoint such as sns.ap-southeast-2.amazonaws.com.
+_SNS_HOST_RE = re.compile(r"sns(?:\.[a-z0-9-]+)?\.amazonaws\.com")
+
 
 def is_allowed_cert_url(cert_url: str) -> tuple[bool, str]:
     """Validate SNS SigningCertURL host and path."""
@@ -19,29 +36,20 @@ def is_allowed_cert_url(cert_url: str) -> tuple[bool, str]:
         return False, "SigningCertURL must use https"
     if not parsed.hostname:
         return False, "SigningCertURL missing hostname"
-    host = parsed.hostname
-    if host != "sns.amazonaws.com" and not (host.startswith("sns.") and host.endswith(".amazonaws.com")):
+    if not _SNS_HOST_RE.fullmatch(parsed.hostname):
         return False, "SigningCertURL hostname is not allowed"
     if not parsed.path.startswith("/SimpleNotificationService-"):
         return False, "SigningCertURL path is not allowed"
     return True, "ok"
 
 
+_NOTIFICATION_FIELDS = ("Message", "MessageId", "Subject", "Timestamp", "TopicArn", "Type")
+_SUBSCRIPTION_FIELDS = ("Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type")
+
+
 def _build_string_to_sign(payload: dict[str, Any]) -> str:
-    message_type = payload.get("Type")
-    if message_type == "Notification":
-        fields = ["Message", "MessageId", "Subject", "Timestamp", "TopicArn", "Type"]
-    else:
-        fields = ["Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type"]
-
-    parts: list[str] = []
-    for field in fields:
-        value = payload.get(field)
-        if value is None:
-            continue
-        parts.append(field)
-        parts.append(str(value))
-    return "\n".join(parts) + "\n"
+    fields = _NOTIFICATION_FIELDS if payload.get("Type") == "Notification" else _SUBSCRIPTION_FIELDS
+    return "".join(f"{field}\n{value}\n" for field in fields if (value := payload.get(field)) is not None)
 
 
 def _fetch_url(url: str, timeout_seconds: int) -> bytes:
@@ -50,14 +58,44 @@ def _fetch_url(url: str, timeout_seconds: int) -> bytes:
         return response.read()
 
 
-def _run_openssl(args: list[str], input_bytes: bytes | None, timeout_seconds: int) -> subprocess.CompletedProcess:
-    return subprocess.run(
-        args,
-        input=input_bytes,
-        capture_output=True,
-        check=False,
-        timeout=timeout_seconds,
-    )
+class _SigningCertError(Exception):
+    """Raised when the signing certificate cannot be turned into a public key."""
+
+
+@lru_cache(maxsize=32)
+def _load_signing_pubkey(cert_url: str, timeout_seconds: int):
+    """Fetch a SigningCertURL and parse it once per certificate into ``(public_key, not_valid_after)``.
+
+    SNS signs with the same certificate until it rotates, so this skips the HTTPS fetch and the
+    X.509 parse for nearly every message. Failures raise and are therefore never cached, and
+    URLs outside the SNS allowlist are refused here too so nothing else can seed the cache.
+    """
+    allowed, reason = is_allowed_cert_url(cert_url)
+    if not allowed:
+        raise _SigningCertError(reason)
+    try:
+        cert_pem = _fetch_url(cert_url, timeout_seconds)
+    except Exception as exc:  # pragma: no cover - network errors
+        logger.warning("Failed to fetch SNS cert: %s", exc)
+        raise _SigningCertError("Failed to fetch SigningCertURL") from exc
+
+    try:
+        cert = x509.load_pem_x509_certificate(cert_pem)
+        return cert.public_key(), cert.not_valid_after_utc
+    except ValueError as exc:
+        raise _SigningCertError("Failed to extract public key") from exc
+
+
+def _get_signing_pubkey(cert_url: str, timeout_seconds: int):
+    """Return the cached public key, refetching once the cached certificate has expired."""
+    pubkey, not_valid_after = _load_signing_pubkey(cert_url, timeout_seconds)
+    if utcnow() > not_valid_after:
+        # lru_cache cannot drop one entry; expiry is rare and the other certs reload on demand.
+        _load_signing_pubkey.cache_clear()
+        pubkey, not_valid_after = _load_signing_pubkey(cert_url, timeout_seconds)
+        if utcnow() > not_valid_after:
+            raise _SigningCertError("SigningCertURL certificate has expired")
+    return pubkey
 
 
 def verify_sns_signature(payload: dict[str, Any], timeout_seconds: int) -> tuple[bool, str]:
@@ -69,52 +107,29 @@ def verify_sns_signature(payload: dict[str, Any], timeout_seconds: int) -> tuple
         return False, "Unsupported SignatureVersion"
     if not signature_b64 or not cert_url:
         return False, "Missing Signature or SigningCertURL"
+    if x509 is None:  # pragma: no cover - dependency notice
+        return False, "cryptography is not available for signature verification"
 
+    # Only allow-listed URLs ever reach the cache.
     allowed, reason = is_allowed_cert_url(cert_url)
     if not allowed:
         return False, reason
 
-    try:
-        cert_pem = _fetch_url(cert_url, timeout_seconds)
-    except Exception as exc:  # pragma: no cover - network errors
-        logger.warning("Failed to fetch SNS cert: %s", exc)
-        return False, "Failed to fetch SigningCertURL"
-
     try:
         signature = base64.b64decode(signature_b64)
     except Exception:
         return False, "Invalid Signature encoding"
 
-    data_to_sign = _build_string_to_sign(payload).encode("utf-8")
+    # hashlib's SHA-1 binds straight to OpenSSL; hand cryptography the digest instead of the message.
+    digest = hashlib.sha1(_build_string_to_sign(payload).encode("utf-8")).digest()
 
     try:
-        with tempfile.NamedTemporaryFile() as cert_file, tempfile.NamedTemporaryFile() as pubkey_file, tempfile.NamedTemporaryFile() as data_file, tempfile.NamedTemporaryFile() as sig_file:
-            cert_file.write(cert_pem)
-            cert_file.flush()
-            pubkey_result = _run_openssl(
-                ["openssl", "x509", "-pubkey", "-noout", "-in", cert_file.name],
-                input_bytes=None,
-                timeout_seconds=timeout_seconds,
-            )
-            if pubkey_result.returncode != 0:
-                return False, "Failed to extract public key"
-            pubkey_file.write(pubkey_result.stdout)
-            pubkey_file.flush()
-
-            data_file.write(data_to_sign)
-            data_file.flush()
-            sig_file.write(signature)
-            sig_file.flush()
-
-            verify_result = _run_openssl(
-                ["openssl", "dgst", "-sha1", "-verify", pubkey_file.name, "-signature", sig_file.name, data_file.name],
-                input_bytes=None,
-                timeout_seconds=timeout_seconds,
-            )
-            if verify_result.returncode != 0:
-                return False, "Signature verification failed"
-    except FileNotFoundError:
-        return False, "openssl is not available for signature verification"
+        pubkey = _get_signing_pubkey(cert_url, timeout_seconds)
+        pubkey.verify(signature, digest, padding.PKCS1v15(), Prehashed(hashes.SHA1()))
+    except InvalidSignature:
+        return False, "Signature verification failed"
+    except _SigningCertError as exc:
+        return False, str(exc)
     except Exception:
         return False, "Signature verification error"
 
@@ -128,10 +143,3 @@ def confirm_subscription(subscribe_url: str, timeout_seconds: int) -> bool:
     except Exception as exc:  # pragma: no cover - network errors
         logger.warning("Failed to confirm SNS subscription: %s", exc)
         return False
-
-
-def dumps_payload(payload: dict[str, Any], max_bytes: int = 32768) -> str:
-    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=True)
-    if len(raw) > max_bytes:
-        return raw[:max_bytes]
-    return raw
@@ -0,0 +1,15 @@
+"""Input validation helpers shared by request models."""
+from __future__ import annotations
+
+import re
+
+# Deliberately shallow: one "@", no whitespace, and a dot in the domain. Compiled once at import.
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def normalize_email(value: str) -> str:
+    """Validate an address and return it lower-cased, raising ValueError if it is malformed."""
+    value = value.strip()
+    if not EMAIL_RE.fullmatch(value):
+        raise ValueError("invalid email")
+    return value.lower()
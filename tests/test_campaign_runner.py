@@ -0,0 +1,109 @@
+"""Tests for deferring email_logs indexes around large campaign sends."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import settings
+from src.queue import campaign_runner
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def execution_options(self, **kwargs):  # noqa: ARG002
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, params=None):  # noqa: ARG002
+        self.statements.append(str(statement))
+        return SimpleNamespace(scalars=lambda: [])
+
+
+class _FakeSession:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+    def close(self):
+        self.calls.append("close")
+
+
+def _count_recipients(count):
+    calls = []
+
+    def count_recipients(db, tenant_id):  # noqa: ARG001
+        calls.append(tenant_id)
+        return count
+
+    return calls, count_recipients
+
+
+def test_deferral_skips_count_on_sqlite(monkeypatch):
+    monkeypatch.setattr(campaign_runner, "engine", SimpleNamespace(dialect=SimpleNamespace(name="sqlite")))
+    monkeypatch.setattr(settings, "campaign_defer_index_threshold", 1)
+    calls, count_recipients = _count_recipients(10)
+    monkeypatch.setattr(campaign_runner.campaign_service, "count_recipients", count_recipients)
+
+    with campaign_runner.deferred_log_indexes(_FakeSession(), tenant_id=1):
+        pass
+
+    assert calls == []
+
+
+@pytest.fixture()
+def postgres_engine(monkeypatch):
+    conn = _FakeConnection()
+    fake_engine = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), connect=lambda: conn)
+    monkeypatch.setattr(campaign_runner, "engine", fake_engine)
+    return conn
+
+
+def test_deferral_skips_count_without_threshold(monkeypatch, postgres_engine):
+    monkeypatch.setattr(settings, "campaign_defer_index_threshold", 0)
+    calls, count_recipients = _count_recipients(10)
+    monkeypatch.setattr(campaign_runner.campaign_service, "count_recipients", count_recipients)
+
+    with campaign_runner.deferred_log_indexes(_FakeSession(), tenant_id=1):
+        pass
+
+    assert calls == []
+    assert postgres_engine.statements == []
+
+
+def test_deferral_below_threshold_leaves_indexes(monkeypatch, postgres_engine):
+    monkeypatch.setattr(settings, "campaign_defer_index_threshold", 100)
+    calls, count_recipients = _count_recipients(10)
+    monkeypatch.setattr(campaign_runner.campaign_service, "count_recipients", count_recipients)
+
+    with campaign_runner.deferred_log_indexes(_FakeSession(), tenant_id=7):
+        pass
+
+    assert calls == [7]
+    assert postgres_engine.statements == []
+
+
+def test_deferral_rolls_back_and_reraises_on_error(monkeypatch, postgres_engine):
+    monkeypatch.setattr(settings, "campaign_defer_index_threshold", 5)
+    monkeypatch.setattr(campaign_runner.campaign_service, "count_recipients", _count_recipients(10)[1])
+    db = _FakeSession()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        with campaign_runner.deferred_log_indexes(db, tenant_id=1):
+            raise RuntimeError("boom")
+
+    assert db.calls == ["rollback", "close"]
+    statements = postgres_engine.statements
+    assert statements[0].startswith("SELECT pg_advisory_lock")
+    assert any(statement.startswith("DROP INDEX CONCURRENTLY") for statement in statements)
+    assert any(statement.startswith("CREATE INDEX CONCURRENTLY") for statement in statements)
+    assert statements[-1].startswith("SELECT pg_advisory_unlock")
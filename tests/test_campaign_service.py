@@ -0,0 +1,93 @@
+"""Tests for campaign recipient loading and bulk enqueue."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from src.db import models
+from src.services import campaign_service
+from src.services.ses import campaign_content_digest
+
+
+def _make_db_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.commit()
+    return db
+
+
+def test_enqueue_bulk_emails_streams_recipients_in_batches(monkeypatch):
+    db = _make_db_session()
+    for i in range(5):
+        db.add(models.Subscriber(tenant_id=1, email=f"user{i}@example.com", status="active"))
+    db.add(models.Subscriber(tenant_id=1, email="gone@example.com", status="unsubscribed"))
+    db.add(models.Subscriber(tenant_id=1, email="blocked@example.com", status="active"))
+    db.add(models.SuppressedEmail(tenant_id=1, email="blocked@example.com", reason="bounce"))
+    campaign = models.Campaign(tenant_id=1, name="Launch", subject="Hi", body="Body")
+    db.add(campaign)
+    db.commit()
+
+    sent_to = []
+    jobs_per_pipeline = []
+
+    def fake_enqueue_bulk_email_jobs(jobs):
+        # The batch's EmailLog rows are committed before any job can reach a worker.
+        assert not db.in_transaction()
+        jobs_per_pipeline.append([len(job["recipients"]) for job in jobs])
+        for job in jobs:
+            assert job.keys() == {"campaign_id", "content_digest", "recipients", "job_id"}
+            assert (job["campaign_id"], job["content_digest"]) == (campaign.id, campaign_content_digest("Hi", "Body"))
+            sent_to.extend((email, email_log_id, job["job_id"]) for email_log_id, email in job["recipients"])
+        return [SimpleNamespace(id=job["job_id"]) for job in jobs]
+
+    monkeypatch.setattr(campaign_service, "enqueue_bulk_email_jobs", fake_enqueue_bulk_email_jobs)
+    monkeypatch.setattr(campaign_service, "RECIPIENT_BATCH_SIZE", 4)
+    monkeypatch.setattr(campaign_service, "SEND_BATCH_SIZE", 3)
+
+    assert campaign_service.count_recipients(db, 1) == 5
+    recipients = campaign_service.load_recipients(db, 1)
+    enqueued = campaign_service.enqueue_bulk_emails(db, campaign, recipients)
+    db.commit()
+
+    assert enqueued == 5
+    assert jobs_per_pipeline == [[3, 1], [1]]
+    logs = db.execute(select(models.EmailLog).order_by(models.EmailLog.id)).scalars().all()
+    assert [log.recipient_email for log in logs] == [f"user{i}@example.com" for i in range(5)]
+    assert [(log.recipient_email, log.id, log.provider_job_id) for log in logs] == sent_to
+    assert len({log.provider_job_id for log in logs}) == 3
+
+
+def test_load_recipients_streams_column_rows():
+    db = _make_db_session()
+    db.add_all([models.Subscriber(tenant_id=1, email=f"user{i}@example.com") for i in range(3)])
+    db.commit()
+
+    result = campaign_service.load_recipients(db, 1)
+    rows = list(result)
+
+    assert not any(isinstance(row, models.Subscriber) for row in rows)
+    assert [(row.id, row.email) for row in rows] == [(i, f"user{i - 1}@example.com") for i in range(1, 4)]
+
+
+def test_update_campaign_status_reuses_loaded_campaign():
+    db = _make_db_session()
+    campaign = models.Campaign(tenant_id=1, name="Launch", subject="Hi", body="Body")
+    db.add(campaign)
+    db.commit()
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        loaded = campaign_service.validate_campaign(db, campaign.id)
+        campaign_service.update_campaign_status(db, campaign.id, "sending")
+        db.flush()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert loaded.status == "sending"
+    # One SELECT to load it after the commit expired it, then only the UPDATE.
+    assert statements == ["SELECT", "UPDATE"]
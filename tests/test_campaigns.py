@@ -0,0 +1,183 @@
+"""Tests for the campaign routes."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException, Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.api.routes import campaigns
+from src.db import models
+
+
+@pytest.fixture(autouse=True)
+def _clear_campaign_cache():
+    campaigns.campaign_cache.clear()
+    yield
+    campaigns.campaign_cache.clear()
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'campaigns.db'}", future=True)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def adb(tmp_path, db):
+    # NullPool: every asyncio.run() below gets a fresh event loop, so connections must not be reused.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'campaigns.db'}", poolclass=NullPool)
+    session = async_sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    asyncio.run(session.close())
+    asyncio.run(engine.dispose())
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_create_campaign_returns_defaults(db, adb):
+    payload = campaigns.CampaignCreate(tenant_id=1, name="Launch", subject="Hello", body="Welcome!")
+
+    response = run(campaigns.create_campaign(payload, db=adb))
+
+    assert response.id is not None
+    assert response.status == "draft"
+    assert db.query(models.Campaign).count() == 1
+
+
+def test_create_campaigns_bulk_preserves_order(db, adb):
+    payload = [
+        campaigns.CampaignCreate(tenant_id=1, name=f"Campaign {i}", subject="Hi", body="Body")
+        for i in range(3)
+    ]
+
+    response = run(campaigns.create_campaigns_bulk(payload, db=adb))
+
+    assert [c.name for c in response] == ["Campaign 0", "Campaign 1", "Campaign 2"]
+    assert all(c.status == "draft" for c in response)
+    assert db.query(models.Campaign).count() == 3
+
+
+def test_list_campaigns_filters_by_tenant(db, adb):
+    db.add(models.Tenant(id=2, name="Other", contact_email="ops@other.com"))
+    db.commit()
+    run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+    run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=2, name="B", subject="s", body="b"), db=adb))
+
+    response = run(campaigns.list_campaigns(tenant_id=1, limit=50, cursor=None, db=adb))
+
+    assert [c.name for c in response.items] == ["A"]
+    assert response.next_cursor is None
+
+
+def test_list_campaigns_paginates_with_cursor(db, adb):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        db.add(models.Campaign(tenant_id=1, name=f"C{i}", subject="s", body="b", created_at=created_at))
+    db.commit()
+
+    first = run(campaigns.list_campaigns(tenant_id=None, limit=2, cursor=None, db=adb))
+    second = run(campaigns.list_campaigns(tenant_id=None, limit=2, cursor=first.next_cursor, db=adb))
+    third = run(campaigns.list_campaigns(tenant_id=None, limit=2, cursor=second.next_cursor, db=adb))
+
+    assert [c.name for c in first.items] == ["C4", "C3"]
+    assert [c.name for c in second.items] == ["C2", "C1"]
+    assert [c.name for c in third.items] == ["C0"]
+    assert third.next_cursor is None
+
+
+def test_list_campaigns_rejects_bad_cursor(db, adb):
+    with pytest.raises(HTTPException) as excinfo:
+        run(campaigns.list_campaigns(tenant_id=None, limit=2, cursor="not-a-cursor", db=adb))
+    assert excinfo.value.status_code == 400
+
+
+def test_schedule_and_cancel_campaign(db, adb):
+    created = run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+
+    scheduled = run(campaigns.schedule_campaign(
+        created.id, campaigns.CampaignSchedule(scheduled_at=datetime(2030, 1, 1, tzinfo=timezone.utc)), db=adb
+    ))
+    assert scheduled.status == "scheduled"
+
+    cancelled = run(campaigns.cancel_campaign_schedule(created.id, db=adb))
+    assert cancelled.status == "draft"
+    assert db.get(models.Campaign, created.id).scheduled_at is None
+
+
+def test_delete_campaign_detaches_logs(db, adb):
+    created = run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+    db.add(models.EmailLog(tenant_id=1, campaign_id=created.id, status="sent"))
+    db.commit()
+
+    background_tasks = BackgroundTasks()
+    run(campaigns.delete_campaign(created.id, background_tasks, db=adb))
+
+    assert db.query(models.Campaign).count() == 0
+    assert db.query(models.EmailLog).one().campaign_id is None
+    [task] = background_tasks.tasks
+    assert (task.func, task.args) == (campaigns.ses_service.delete_campaign_templates, (created.id,))
+    with pytest.raises(HTTPException) as excinfo:
+        run(campaigns.delete_campaign(created.id, BackgroundTasks(), db=adb))
+    assert excinfo.value.status_code == 404
+
+
+def test_get_campaign_cache_invalidated_on_write(db, adb):
+    created = run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+    assert run(campaigns.get_campaign(created.id, Response(), db=adb)).status == "draft"
+
+    run(campaigns.schedule_campaign(
+        created.id, campaigns.CampaignSchedule(scheduled_at=datetime(2030, 1, 1, tzinfo=timezone.utc)), db=adb
+    ))
+
+    assert run(campaigns.get_campaign(created.id, Response(), db=adb)).status == "scheduled"
+    assert run(campaigns.preview_campaign(created.id, _request(), Response(), db=adb)).subject == "s"
+
+
+def test_update_campaign_only_touches_submitted_fields(db, adb):
+    created = run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+
+    updated = run(campaigns.update_campaign(created.id, campaigns.CampaignUpdate(name="B", subject=None), db=adb))
+
+    assert (updated.name, updated.subject, updated.body) == ("B", "s", "b")
+    unchanged = run(campaigns.update_campaign(created.id, campaigns.CampaignUpdate(), db=adb))
+    assert unchanged.name == "B"
+
+
+def test_preview_campaign_honours_etag(db, adb):
+    created = run(campaigns.create_campaign(campaigns.CampaignCreate(tenant_id=1, name="A", subject="s", body="b"), db=adb))
+    response = Response()
+
+    preview = run(campaigns.preview_campaign(created.id, _request(), response, db=adb))
+    etag = response.headers["etag"]
+    assert preview.body == "b"
+    assert etag.startswith('W/"')
+
+    not_modified = run(campaigns.preview_campaign(created.id, _request(if_none_match=etag), Response(), db=adb))
+    assert not_modified.status_code == 304
+
+    stale = run(campaigns.preview_campaign(created.id, _request(if_none_match='W/"0"'), Response(), db=adb))
+    assert stale.subject == "s"
+
+    # An edit within the same updated_at tick still changes the tag.
+    campaign = campaigns.CampaignResponse(id=1, tenant_id=1, name="A", subject="s", body="b", status="draft")
+    edited = campaign.model_copy(update={"body": "b2"})
+    assert campaigns._campaign_etag(campaign) != campaigns._campaign_etag(edited)
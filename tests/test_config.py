@@ -0,0 +1,37 @@
+"""Tests for lazily loaded settings."""
+from __future__ import annotations
+
+import pytest
+
+from src.core import config
+
+
+def test_settings_proxy_builds_once_and_forwards(monkeypatch):
+    monkeypatch.setattr(config, "_settings", None)
+
+    assert config.settings.app_name == config.get_settings().app_name
+    built = config._settings
+    assert built is not None
+    assert config.get_settings() is built
+
+    monkeypatch.setattr(config.settings, "rate_limit_per_minute", 7)
+    assert built.rate_limit_per_minute == 7
+
+
+@pytest.mark.parametrize(
+    ("database_url", "expected"),
+    [
+        ("postgresql://u:p%40ss@db:5432/app?sslmode=require", "postgresql+psycopg://u:p%40ss@db:5432/app?sslmode=require"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+psycopg://u:p@db/app"),
+        ("postgresql+psycopg://u:p@db/app", "postgresql+psycopg://u:p@db/app"),
+        ("sqlite:///./local.db", "sqlite+aiosqlite:///./local.db"),
+        ("sqlite+pysqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+    ],
+)
+def test_async_database_url_maps_sync_drivers(database_url, expected):
+    assert config.Settings(database_url=database_url).async_database_url == expected
+
+
+def test_async_database_url_rejects_unknown_driver():
+    with pytest.raises(ValueError, match="pg8000"):
+        config.Settings(database_url="postgresql+pg8000://u:p@db/app").async_database_url
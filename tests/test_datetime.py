@@ -0,0 +1,17 @@
+"""Tests for UTC timestamp helpers."""
+from __future__ import annotations
+
+from datetime import UTC
+
+from src.utils import datetime as dt_utils
+
+
+def test_utcnow_batch_reuses_value_within_a_millisecond(monkeypatch):
+    ticks = iter([10_000_000, 10_500_000, 11_000_000])
+    monkeypatch.setattr(dt_utils.time, "monotonic_ns", lambda: next(ticks))
+    monkeypatch.setattr(dt_utils, "_batch_now", None)
+
+    first = dt_utils.utcnow_batch()
+    assert dt_utils.utcnow_batch() is first
+    assert dt_utils.utcnow_batch() is not first
+    assert first.tzinfo is UTC
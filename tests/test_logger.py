@@ -0,0 +1,32 @@
+"""Tests for logging configuration."""
+from __future__ import annotations
+
+import logging
+from logging.handlers import QueueHandler
+
+from src.utils import logger as logger_module
+
+
+def test_configure_logging_routes_records_through_a_queue(monkeypatch):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    monkeypatch.setattr(logger_module, "_listener", None)
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append((record.msg, record.getMessage()))
+
+    try:
+        logger_module.configure_logging()
+        assert len(root.handlers) == 1 and isinstance(root.handlers[0], QueueHandler)
+        listener = logger_module._listener
+        listener.handlers = (*listener.handlers, Capture())
+
+        logger_module.logger.warning("queued %s", "record")
+        logger_module._stop_listener()
+        # The message is formatted on the listener thread, not by the logging call.
+        assert records == [("queued %s", "queued record")]
+    finally:
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
@@ -0,0 +1,71 @@
+"""Tests for the database model and session setup."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from src.api.pagination import keyset_page
+from src.db import models
+from src.db.session import _make_connect_args
+
+
+def test_metadata_has_one_table_per_model():
+    assert sorted(models.Base.metadata.tables) == [
+        "campaigns",
+        "email_events",
+        "email_logs",
+        "subscribers",
+        "suppressed_emails",
+        "tenants",
+    ]
+
+
+def test_connect_args_by_driver(tmp_path):
+    sqlite_args = _make_connect_args(f"sqlite:///{tmp_path / 'data' / 'app.db'}")
+    assert sqlite_args == {"check_same_thread": False}
+    assert (tmp_path / "data").is_dir()
+
+    pg_args = _make_connect_args("postgresql+psycopg://user:pw@localhost/db")
+    assert pg_args["sslmode"] == "require"
+
+
+def test_raiseload_strict_blocks_lazy_loads():
+    engine = create_engine("sqlite://", future=True)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.add(models.Campaign(id=1, tenant_id=1, name="Launch", subject="Hi", body="Body"))
+    db.commit()
+    db.expunge_all()
+
+    stmt = select(models.Campaign).where(models.Campaign.id == 1)
+    strict = db.execute(stmt.execution_options(raiseload_strict=True)).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        strict.tenant
+    db.expunge_all()
+
+    relaxed = db.execute(stmt).scalar_one()
+    assert relaxed.tenant.name == "Acme"
+
+
+@pytest.mark.parametrize(
+    ("model", "index_name"),
+    [
+        (models.Subscriber, "ix_subscribers_tenant_created"),
+        (models.SuppressedEmail, "ix_suppressed_emails_tenant_created"),
+    ],
+)
+def test_keyset_listing_is_served_by_an_index(model, index_name):
+    engine = create_engine("sqlite://", future=True)
+    models.Base.metadata.create_all(bind=engine)
+    stmt = keyset_page(
+        select(model.id, model.created_at).where(model.tenant_id == 1), model.created_at, model.id, cursor=None, limit=50
+    )
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert index_name in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,25 @@
+"""Guard against routers being registered more than once."""
+from __future__ import annotations
+
+from src.api.app import app
+
+
+def test_routes_are_registered_once():
+    keys = [(route.path, frozenset(getattr(route, "methods", None) or ())) for route in app.routes]
+
+    assert len(set(keys)) == len(keys)
+
+
+def test_send_router_is_matched_first():
+    api_paths = [route.path for route in app.routes if not route.path.startswith(("/docs", "/redoc", "/openapi"))]
+
+    assert api_paths[0].startswith("/send")
+
+
+def test_health_is_served_by_orjson():
+    from fastapi.testclient import TestClient
+
+    response = TestClient(app).get("/health")
+
+    assert response.status_code == 200
+    assert response.content == b'{"status":"ok"}'
@@ -5,6 +5,7 @@ import asyncio
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.api.routes import send
 from src.api.routes.send import SendTestRequest, send_test_email
 from src.db import models
 from src.services import ses
@@ -29,3 +30,32 @@ def test_send_test_email(monkeypatch):
     response = asyncio.run(send_test_email(request, db=db))
     assert response.message_id == "test-message-id"
     assert response.queued is False
+
+
+def test_send_test_email_enqueue_writes_log_once(monkeypatch):
+    enqueued = []
+
+    def mock_enqueue_email_job(**kwargs):
+        enqueued.append(kwargs)
+
+    monkeypatch.setattr(send, "enqueue_email_job", mock_enqueue_email_job)
+
+    engine = create_engine("sqlite:///:memory:", future=True)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    request = SendTestRequest(recipient="alice@example.com", subject="Hello", body="Test", enqueue=True)
+    response = asyncio.run(send_test_email(request, db=db))
+
+    log = db.query(models.EmailLog).one()
+    assert response.queued is True
+    assert log.provider_job_id == response.message_id
+    assert enqueued == [
+        {
+            "subject": "Hello",
+            "recipient": "alice@example.com",
+            "body": "Test",
+            "email_log_id": log.id,
+            "job_id": response.message_id,
+        }
+    ]
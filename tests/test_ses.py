@@ -0,0 +1,103 @@
+"""Tests for the SES service wrapper."""
+from __future__ import annotations
+
+from botocore.stub import ANY, Stubber
+
+from src.services.ses import SESService, campaign_template_name
+
+
+def _service():
+    service = SESService(aws_access_key_id="test", aws_secret_access_key="test", region_name="ap-southeast-2")
+    return service, Stubber(service._client_or_raise())
+
+
+def test_send_bulk_email_returns_per_recipient_results():
+    service, stubber = _service()
+    stubber.add_response(
+        "send_bulk_templated_email",
+        {"Status": [{"Status": "Success", "MessageId": "ses-1"}, {"Status": "MessageRejected", "Error": "bad"}]},
+        {
+            "Source": "dhanesh@silverseven.com",
+            "Template": "campaign-1",
+            "DefaultTemplateData": "{}",
+            "Destinations": [
+                {"Destination": {"ToAddresses": ["a@example.com"]}},
+                {"Destination": {"ToAddresses": ["b@example.com"]}},
+            ],
+        },
+    )
+    with stubber:
+        results = service.send_bulk_email(template_name="campaign-1", recipients=["a@example.com", "b@example.com"])
+
+    assert results == [("ses-1", None), (None, "bad")]
+
+
+def test_ensure_template_updates_existing_once():
+    service, stubber = _service()
+    stubber.add_client_error("create_template", service_error_code="AlreadyExists")
+    stubber.add_response("update_template", {})
+    with stubber:
+        service.ensure_template("campaign-1", subject="Hi", text_body="Body")
+        service.ensure_template("campaign-1", subject="Hi", text_body="Body")
+    stubber.assert_no_pending_responses()
+
+
+def test_campaign_template_is_versioned_and_literal():
+    service, stubber = _service()
+    for body in ("Body {{x}}", "New body"):
+        template = {
+            "TemplateName": ANY,
+            "SubjectPart": "Hi \\{{name}}",
+            "TextPart": body.replace("{{", "\\{{"),
+            "HtmlPart": body.replace("{{", "\\{{"),
+        }
+        stubber.add_response("create_template", {}, {"Template": template})
+    with stubber:
+        first = service.ensure_campaign_template(1, subject="Hi {{name}}", text_body="Body {{x}}")
+        assert service.ensure_campaign_template(1, subject="Hi {{name}}", text_body="Body {{x}}") == first
+        edited = service.ensure_campaign_template(1, subject="Hi {{name}}", text_body="New body")
+    stubber.assert_no_pending_responses()
+
+    assert first.startswith("campaign-1-") and edited.startswith("campaign-1-") and edited != first
+
+
+def test_delete_campaign_templates_keeps_current_version():
+    service, stubber = _service()
+    current = campaign_template_name(1, "Hi", "Body")
+    stubber.add_response(
+        "list_templates",
+        {"TemplatesMetadata": [{"Name": "campaign-1-old"}, {"Name": "campaign-12-other"}], "NextToken": "t"},
+        {"MaxItems": 100},
+    )
+    stubber.add_response(
+        "list_templates",
+        {"TemplatesMetadata": [{"Name": "campaign-1-older"}, {"Name": current}]},
+        {"MaxItems": 100, "NextToken": "t"},
+    )
+    stubber.add_response("delete_template", {}, {"TemplateName": "campaign-1-old"})
+    stubber.add_response("delete_template", {}, {"TemplateName": "campaign-1-older"})
+    with stubber:
+        assert service.delete_campaign_templates(1, keep=current) == 2
+    stubber.assert_no_pending_responses()
+
+
+def test_send_bulk_email_recreates_a_deleted_template_once():
+    service, stubber = _service()
+    stubber.add_response("create_template", {}, {"Template": ANY})
+    stubber.add_client_error("send_bulk_templated_email", service_error_code="TemplateDoesNotExist")
+    stubber.add_response("create_template", {}, {"Template": ANY})
+    stubber.add_response("send_bulk_templated_email", {"Status": [{"Status": "Success", "MessageId": "ses-1"}]})
+    with stubber:
+        name = service.ensure_campaign_template(1, subject="Hi", text_body="Body")
+        assert service.send_bulk_email(template_name=name, recipients=["a@example.com"]) == [("ses-1", None)]
+    stubber.assert_no_pending_responses()
+
+
+def test_client_uses_pooled_keepalive_config():
+    service, _ = _service()
+    config = service._client_or_raise().meta.config
+
+    assert config.max_pool_connections == 64
+    assert config.tcp_keepalive is True
+    assert config.retries["mode"] == "adaptive"
+    assert service._client_or_raise() is service._client_or_raise()
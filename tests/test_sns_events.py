@@ -2,31 +2,73 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import json
-from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.x509.oid import NameOID
 from fastapi import HTTPException
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from src.api.routes import events
-from src.core.config import settings
+from src.core.config import Settings, settings
 from src.db import models
 from src.utils import sns as sns_utils
 
 
-def _make_db_session():
-    engine = create_engine(
-        "sqlite+pysqlite:///:memory:",
-        future=True,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+@pytest.fixture(autouse=True)
+def _clear_signing_key_cache():
+    sns_utils._load_signing_pubkey.cache_clear()
+    yield
+    sns_utils._load_signing_pubkey.cache_clear()
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.keys: dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, ex=None):  # noqa: ARG002
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+
+@pytest.fixture(autouse=True)
+def dedup_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(events, "_get_dedup_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'events.db'}", future=True)
     models.Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def adb(tmp_path, db):
+    # NullPool: every asyncio.run() below gets a fresh event loop, so connections must not be reused.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}", poolclass=NullPool)
+    session = async_sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    asyncio.run(session.close())
+    asyncio.run(engine.dispose())
 
 
 def _notification_payload(message: dict) -> dict:
@@ -43,49 +85,69 @@ def _notification_payload(message: dict) -> dict:
 
 def _configure_sns(monkeypatch, *, topic_arn: str = "arn:aws:sns:ap-southeast-2:123456789012:ses-events") -> None:
     monkeypatch.setattr(settings, "sns_verify_signatures", False)
-    monkeypatch.setattr(settings, "sns_allowed_topic_arns", [topic_arn])
+    monkeypatch.setattr(settings, "sns_allowed_topic_arns", frozenset([topic_arn]))
+
+
+def _signing_cert():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "sns.amazonaws.com")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM)
+
+
+def _sign(payload: dict, key) -> dict:
+    data = sns_utils._build_string_to_sign(payload).encode("utf-8")
+    signature = key.sign(data, padding.PKCS1v15(), hashes.SHA1())
+    return {**payload, "Signature": base64.b64encode(signature).decode("ascii")}
 
 
 def test_verify_sns_signature_happy(monkeypatch):
-    payload = _notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}})
+    key, cert_pem = _signing_cert()
+    payload = _sign(_notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}}), key)
 
     def fake_fetch(url, timeout_seconds):  # noqa: ARG001
-        return b"cert"
-
-    def fake_run(args, input_bytes, timeout_seconds):  # noqa: ARG001
-        if "x509" in args:
-            return SimpleNamespace(returncode=0, stdout=b"PUBKEY")
-        if "dgst" in args:
-            return SimpleNamespace(returncode=0, stdout=b"")
-        return SimpleNamespace(returncode=1, stdout=b"")
+        return cert_pem
 
     monkeypatch.setattr(sns_utils, "_fetch_url", fake_fetch)
-    monkeypatch.setattr(sns_utils, "_run_openssl", fake_run)
     ok, _ = sns_utils.verify_sns_signature(payload, 3)
     assert ok is True
 
 
 def test_verify_sns_signature_fail(monkeypatch):
-    payload = _notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}})
+    key, cert_pem = _signing_cert()
+    payload = _sign(_notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}}), key)
+    payload["Message"] = payload["Message"] + " "
 
     def fake_fetch(url, timeout_seconds):  # noqa: ARG001
-        return b"cert"
-
-    def fake_run(args, input_bytes, timeout_seconds):  # noqa: ARG001
-        if "x509" in args:
-            return SimpleNamespace(returncode=0, stdout=b"PUBKEY")
-        if "dgst" in args:
-            return SimpleNamespace(returncode=1, stdout=b"")
-        return SimpleNamespace(returncode=1, stdout=b"")
+        return cert_pem
 
     monkeypatch.setattr(sns_utils, "_fetch_url", fake_fetch)
-    monkeypatch.setattr(sns_utils, "_run_openssl", fake_run)
-    ok, _ = sns_utils.verify_sns_signature(payload, 3)
+    ok, reason = sns_utils.verify_sns_signature(payload, 3)
     assert ok is False
+    assert reason == "Signature verification failed"
 
 
-def test_subscription_confirmation(monkeypatch):
-    db = _make_db_session()
+def test_verify_sns_signature_rejects_bad_certificate(monkeypatch):
+    payload = _notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}})
+
+    def fake_fetch(url, timeout_seconds):  # noqa: ARG001
+        return b"not a certificate"
+
+    monkeypatch.setattr(sns_utils, "_fetch_url", fake_fetch)
+    assert sns_utils.verify_sns_signature(payload, 3) == (False, "Failed to extract public key")
+
+
+def test_subscription_confirmation(monkeypatch, db, adb):
 
     def fake_confirm(url, timeout_seconds):  # noqa: ARG001
         return True
@@ -99,12 +161,11 @@ def test_subscription_confirmation(monkeypatch):
         "TopicArn": "arn:aws:sns:ap-southeast-2:123456789012:ses-events",
         "SubscribeURL": "https://example.com/confirm",
     }
-    result = asyncio.run(events.handle_sns_notification(payload, db=db))
+    result = asyncio.run(events.handle_sns_notification(payload, db=adb))
     assert result["status"] == "confirmed"
 
 
-def test_notification_updates_email_log(monkeypatch):
-    db = _make_db_session()
+def test_notification_updates_email_log(monkeypatch, db, adb):
     log = models.EmailLog(
         recipient_email="success@simulator.amazonses.com",
         message_id="ses-message-id",
@@ -124,7 +185,7 @@ def test_notification_updates_email_log(monkeypatch):
         "delivery": {"timestamp": "2025-12-16T00:00:00.000Z", "smtpResponse": "250 Ok"},
     }
     payload = _notification_payload(message)
-    result = asyncio.run(events.handle_sns_notification(payload, db=db))
+    result = asyncio.run(events.handle_sns_notification(payload, db=adb))
     assert result["status"] == "delivered"
 
     refreshed = db.query(models.EmailLog).filter(models.EmailLog.id == log.id).first()
@@ -133,8 +194,7 @@ def test_notification_updates_email_log(monkeypatch):
     assert events_count == 1
 
 
-def test_event_persisted_without_log(monkeypatch):
-    db = _make_db_session()
+def test_event_persisted_without_log(monkeypatch, db, adb):
     _configure_sns(monkeypatch)
 
     message = {
@@ -143,15 +203,15 @@ def test_event_persisted_without_log(monkeypatch):
         "bounce": {"timestamp": "2025-12-16T00:00:00.000Z", "bounceType": "Permanent"},
     }
     payload = _notification_payload(message)
-    result = asyncio.run(events.handle_sns_notification(payload, db=db))
+    result = asyncio.run(events.handle_sns_notification(payload, db=adb))
     assert result["status"] == "bounced"
     event = db.query(models.EmailEvent).first()
     assert event is not None
     assert event.email_log_id is None
+    assert event.payload_json["MessageId"] == "sns-message-id"
 
 
-def test_topic_arn_not_allowed(monkeypatch):
-    db = _make_db_session()
+def test_topic_arn_not_allowed(monkeypatch, db, adb):
     _configure_sns(monkeypatch, topic_arn="arn:aws:sns:ap-southeast-2:123456789012:allowed")
 
     message = {
@@ -163,6 +223,280 @@ def test_topic_arn_not_allowed(monkeypatch):
     payload["TopicArn"] = "arn:aws:sns:ap-southeast-2:123456789012:blocked"
 
     with pytest.raises(HTTPException) as excinfo:
-        asyncio.run(events.handle_sns_notification(payload, db=db))
+        asyncio.run(events.handle_sns_notification(payload, db=adb))
     assert excinfo.value.status_code == 403
     assert db.query(models.EmailEvent).count() == 0
+
+
+def test_invalid_message_json_rejected(monkeypatch, db, adb):
+    _configure_sns(monkeypatch)
+    payload = _notification_payload({})
+    payload["Message"] = "{not json"
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(events.handle_sns_notification(payload, db=adb))
+    assert excinfo.value.status_code == 400
+
+
+def test_permanent_bounce_suppresses_recipients_once(monkeypatch, db, adb):
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.add(models.Subscriber(tenant_id=1, email="bounce@example.com", status="active"))
+    db.add(models.Subscriber(tenant_id=1, email="other@example.com", status="active"))
+    db.add(models.EmailLog(tenant_id=1, recipient_email="bounce@example.com", message_id="ses-bounce", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+
+    message = {
+        "notificationType": "Bounce",
+        "mail": {"messageId": "ses-bounce", "destination": ["bounce@example.com"]},
+        "bounce": {
+            "timestamp": "2025-12-16T00:00:00.000Z",
+            "bounceType": "Permanent",
+            "bouncedRecipients": [{"emailAddress": "bounce@example.com"}],
+        },
+    }
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+    redelivered = _notification_payload(message)
+    redelivered["MessageId"] = "sns-message-id-2"
+    asyncio.run(events.handle_sns_notification(redelivered, db=adb))
+
+    suppressed = db.query(models.SuppressedEmail).all()
+    assert [(s.tenant_id, s.email, s.reason) for s in suppressed] == [(1, "bounce@example.com", "bounce")]
+    statuses = dict(db.query(models.Subscriber.email, models.Subscriber.status).all())
+    assert statuses == {"bounce@example.com": "suppressed", "other@example.com": "active"}
+
+
+def test_failed_suppression_still_records_event(monkeypatch, db, adb):
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.add(models.SuppressedEmail(tenant_id=1, email="bounce@example.com", reason="manual"))
+    db.add(models.EmailLog(tenant_id=1, recipient_email="bounce@example.com", message_id="ses-bounce", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+    # A plain INSERT hits the unique index, as a racing bounce for the same address would.
+    ignore_conflicts = events.insert_ignore_conflicts
+
+    def plain_suppression_insert(db, model, index_elements, index_where=None):
+        if model is models.SuppressedEmail:
+            return insert(model)
+        return ignore_conflicts(db, model, index_elements, index_where)
+
+    monkeypatch.setattr(events, "insert_ignore_conflicts", plain_suppression_insert)
+
+    message = {
+        "notificationType": "Bounce",
+        "mail": {"messageId": "ses-bounce", "destination": ["bounce@example.com"]},
+        "bounce": {
+            "timestamp": "2025-12-16T00:00:00.000Z",
+            "bounceType": "Permanent",
+            "bouncedRecipients": [{"emailAddress": "bounce@example.com"}],
+        },
+    }
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    assert db.query(models.EmailEvent).count() == 1
+    assert db.query(models.EmailLog).one().status == "bounced"
+
+
+def test_redelivered_notification_records_events_once(monkeypatch, db, adb):
+    for recipient in ("a@example.com", "b@example.com"):
+        db.add(models.EmailLog(recipient_email=recipient, message_id="ses-multi", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+
+    message = {
+        "notificationType": "Delivery",
+        "mail": {"messageId": "ses-multi", "destination": ["a@example.com", "b@example.com"]},
+        "delivery": {"timestamp": "2025-12-16T00:00:00.000Z", "smtpResponse": "250 Ok"},
+    }
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    recorded = db.query(models.EmailEvent.email_log_id, models.EmailEvent.sns_message_id).all()
+    assert sorted(recorded) == [(1, "sns-message-id"), (2, "sns-message-id")]
+
+
+def test_redelivered_notification_short_circuits_on_redis(monkeypatch, db, adb, dedup_redis):
+    db.add(models.EmailLog(recipient_email="a@example.com", message_id="ses-dup", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+
+    message = {
+        "notificationType": "Delivery",
+        "mail": {"messageId": "ses-dup", "destination": ["a@example.com"]},
+        "delivery": {"timestamp": "2025-12-16T00:00:00.000Z", "smtpResponse": "250 Ok"},
+    }
+    first = asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+    second = asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    assert first == {"status": "delivered"}
+    assert second == {"status": "duplicate"}
+    assert "sns:evt:arn:aws:sns:ap-southeast-2:123456789012:ses-events:sns-message-id" in dedup_redis.keys
+    assert db.query(models.EmailEvent).count() == 1
+
+
+def test_failed_notification_releases_dedup_key(monkeypatch, db, adb, dedup_redis):
+    _configure_sns(monkeypatch)
+    payload = _notification_payload({"mail": {}})
+    payload["Message"] = "{not json"
+
+    with pytest.raises(HTTPException):
+        asyncio.run(events.handle_sns_notification(payload, db=adb))
+
+    assert dedup_redis.keys == {}
+
+
+def test_redelivery_after_dedup_key_expiry_records_events_once(monkeypatch, db, adb, dedup_redis):
+    db.add(models.EmailLog(recipient_email="a@example.com", message_id="ses-expired", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+
+    matched = {"notificationType": "Delivery", "mail": {"messageId": "ses-expired", "destination": ["a@example.com"]}}
+    unmatched = {"notificationType": "Delivery", "mail": {"messageId": "ses-unknown"}}
+    for message in (matched, unmatched):
+        payload = {**_notification_payload(message), "MessageId": message["mail"]["messageId"]}
+        for _ in range(2):
+            asyncio.run(events.handle_sns_notification(payload, db=adb))
+            # The Redis key expired or was flushed; only the unique indexes stop the duplicate.
+            dedup_redis.keys.clear()
+
+    recorded = db.query(models.EmailEvent.sns_message_id, models.EmailEvent.email_log_id).all()
+    assert sorted(recorded, key=str) == sorted([("ses-expired", 1), ("ses-unknown", None)], key=str)
+
+
+def test_cancelled_notification_releases_dedup_key(monkeypatch, db, adb, dedup_redis):
+    _configure_sns(monkeypatch)
+
+    async def cancelled(*args, **kwargs):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(events, "_process_notification", cancelled)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(events.handle_sns_notification(_notification_payload({"mail": {}}), db=adb))
+
+    assert dedup_redis.keys == {}
+
+
+def test_claimed_notification_skips_event_lookup(monkeypatch, db, adb):
+    _configure_sns(monkeypatch)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(adb.bind.sync_engine, "before_cursor_execute", listener)
+
+    message = {"notificationType": "Delivery", "mail": {"messageId": "ses-none", "destination": ["a@example.com"]}}
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    assert not [statement for statement in statements if "FROM email_events" in statement]
+    assert db.query(models.EmailEvent).count() == 1
+
+
+def test_redis_unavailable_falls_back_to_database(monkeypatch, db, adb):
+    db.add(models.EmailLog(recipient_email="a@example.com", message_id="ses-nored", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+    monkeypatch.setattr(events, "_get_dedup_redis", lambda: None)
+
+    message = {
+        "notificationType": "Delivery",
+        "mail": {"messageId": "ses-nored", "destination": ["a@example.com"]},
+        "delivery": {"timestamp": "2025-12-16T00:00:00.000Z", "smtpResponse": "250 Ok"},
+    }
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    assert db.query(models.EmailEvent).count() == 1
+
+
+def test_parse_timestamp_formats():
+    expected = datetime(2025, 12, 16, tzinfo=timezone.utc)
+
+    assert events._parse_timestamp("2025-12-16T00:00:00.000Z") == expected
+    assert events._parse_timestamp("Tue, 16 Dec 2025 00:00:00 +0000") == expected
+    assert events._parse_timestamp("not a timestamp") is None
+    assert events._parse_timestamp(None) is None
+
+
+def test_allowed_topic_arns_are_frozen():
+    parsed = Settings(sns_allowed_topic_arns="arn:one, arn:two,,")
+
+    assert parsed.sns_allowed_topic_arns == frozenset({"arn:one", "arn:two"})
+
+
+def test_signing_key_fetched_once_per_cert(monkeypatch):
+    key, cert_pem = _signing_cert()
+    payload = _sign(_notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}}), key)
+    fetches = []
+
+    def fake_fetch(url, timeout_seconds):  # noqa: ARG001
+        fetches.append(url)
+        return cert_pem
+
+    monkeypatch.setattr(sns_utils, "_fetch_url", fake_fetch)
+
+    assert sns_utils.verify_sns_signature(payload, 3)[0] is True
+    assert sns_utils.verify_sns_signature(payload, 3)[0] is True
+    assert fetches == [payload["SigningCertURL"]]
+
+
+def test_expired_signing_cert_is_refetched(monkeypatch):
+    key, cert_pem = _signing_cert()
+    payload = _sign(_notification_payload({"notificationType": "Delivery", "mail": {"messageId": "mid"}}), key)
+    fetches = []
+
+    def fake_fetch(url, timeout_seconds):  # noqa: ARG001
+        fetches.append(url)
+        return cert_pem
+
+    monkeypatch.setattr(sns_utils, "_fetch_url", fake_fetch)
+    assert sns_utils.verify_sns_signature(payload, 3)[0] is True
+
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+    monkeypatch.setattr(sns_utils, "utcnow", lambda: later)
+    assert sns_utils.verify_sns_signature(payload, 3) == (False, "SigningCertURL certificate has expired")
+    assert len(fetches) == 2
+
+
+@pytest.mark.parametrize(
+    ("host", "allowed"),
+    [
+        ("sns.amazonaws.com", True),
+        ("sns.ap-southeast-2.amazonaws.com", True),
+        ("SNS.us-east-1.amazonaws.com", True),
+        ("sns.evil.example.amazonaws.com", False),
+        ("sns.amazonaws.com.evil.com", False),
+        ("s3.amazonaws.com", False),
+    ],
+)
+def test_cert_url_host_allowlist(host, allowed):
+    ok, _ = sns_utils.is_allowed_cert_url(f"https://{host}/SimpleNotificationService-abc.pem")
+    assert ok is allowed
+
+
+def test_signing_key_loader_refuses_unlisted_urls(monkeypatch):
+    fetches = []
+    monkeypatch.setattr(sns_utils, "_fetch_url", lambda url, timeout_seconds: fetches.append(url))
+
+    with pytest.raises(sns_utils._SigningCertError):
+        sns_utils._load_signing_pubkey("https://evil.example.com/SimpleNotificationService-x.pem", 3)
+    assert fetches == []
+    assert sns_utils._load_signing_pubkey.cache_info().currsize == 0
+
+
+def test_mixed_case_recipients_match_stored_addresses(monkeypatch, db, adb):
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.add(models.EmailLog(tenant_id=1, recipient_email="Bounce@Example.com", message_id="ses-case", status="sent"))
+    db.commit()
+    _configure_sns(monkeypatch)
+
+    message = {
+        "notificationType": "Bounce",
+        "mail": {"messageId": "ses-case", "destination": ["BOUNCE@example.com"]},
+        "bounce": {
+            "timestamp": "2025-12-16T00:00:00.000Z",
+            "bounceType": "Permanent",
+            "bouncedRecipients": [{"emailAddress": "BOUNCE@example.com"}],
+        },
+    }
+    asyncio.run(events.handle_sns_notification(_notification_payload(message), db=adb))
+
+    assert db.query(models.EmailLog.recipient_email, models.EmailLog.status).one() == ("bounce@example.com", "bounced")
+    assert db.query(models.SuppressedEmail.email).one() == ("bounce@example.com",)
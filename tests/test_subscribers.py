@@ -0,0 +1,146 @@
+"""Tests for the subscriber routes."""
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import subscribers
+from src.db import models
+
+
+def _make_db_session():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.Tenant(id=1, name="Acme", contact_email="ops@acme.com"))
+    db.commit()
+    return db
+
+
+def _upload(csv_text: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(csv_text.encode("utf-8")), filename="subscribers.csv")
+
+
+def test_bulk_import_skips_existing_duplicate_and_invalid_rows(monkeypatch):
+    monkeypatch.setattr(subscribers, "IMPORT_BATCH_SIZE", 2)
+    db = _make_db_session()
+    db.add(models.Subscriber(tenant_id=1, email="existing@example.com"))
+    db.commit()
+    csv_text = "\n".join(
+        [
+            "email,first_name,last_name",
+            "existing@example.com,Old,Row",
+            "new@example.com,New,Person",
+            "new@example.com,Dup,Row",
+            "not-an-email,,",
+            "other@example.com,,",
+        ]
+    )
+
+    response = subscribers.bulk_import_subscribers(tenant_id=1, file=_upload(csv_text), db=db)
+
+    assert (response.imported, response.skipped) == (2, 3)
+    rows = dict(db.query(models.Subscriber.email, models.Subscriber.first_name).all())
+    assert rows == {"existing@example.com": None, "new@example.com": "New", "other@example.com": None}
+
+
+def test_bulk_import_reports_partial_import_on_undecodable_file(monkeypatch):
+    monkeypatch.setattr(subscribers, "IMPORT_BATCH_SIZE", 100)
+    db = _make_db_session()
+    rows = "".join(f"user{i:05d}@example.com,,\n" for i in range(500))
+    data = f"email,first_name,last_name\n{rows}".encode("utf-8") + "caf\xe9@example.com,,\n".encode("latin-1")
+    upload = UploadFile(file=io.BytesIO(data), filename="subscribers.csv")
+
+    with pytest.raises(HTTPException) as exc:
+        subscribers.bulk_import_subscribers(tenant_id=1, file=upload, db=db)
+
+    assert exc.value.status_code == 400
+    imported = db.query(models.Subscriber).count()
+    assert imported > 0
+    assert f"Import is partial: {imported} subscribers" in exc.value.detail
+
+
+def test_bulk_import_rejects_undecodable_header():
+    db = _make_db_session()
+    upload = UploadFile(file=io.BytesIO("\xe9mail\n".encode("latin-1")), filename="subscribers.csv")
+
+    with pytest.raises(HTTPException) as exc:
+        subscribers.bulk_import_subscribers(tenant_id=1, file=upload, db=db)
+    assert exc.value.status_code == 400
+
+
+def test_add_subscriber_conflict_returns_409():
+    db = _make_db_session()
+    payload = subscribers.SubscriberCreate(tenant_id=1, email="alice@example.com", first_name="Alice")
+
+    created = subscribers.add_subscriber(payload, db=db)
+
+    assert (created.email, created.first_name, created.status) == ("alice@example.com", "Alice", "active")
+    with pytest.raises(HTTPException) as excinfo:
+        subscribers.add_subscriber(payload, db=db)
+    assert excinfo.value.status_code == 409
+    assert db.query(models.Subscriber).count() == 1
+
+
+def test_list_subscribers_filters_by_tenant():
+    db = _make_db_session()
+    db.add(models.Tenant(id=2, name="Other", contact_email="ops@other.com"))
+    db.add(models.Subscriber(tenant_id=1, email="a@example.com", first_name="A"))
+    db.add(models.Subscriber(tenant_id=2, email="b@example.com"))
+    db.commit()
+
+    response = subscribers.list_subscribers(tenant_id=1, limit=50, cursor=None, db=db)
+
+    assert [(s.email, s.first_name, s.status) for s in response.items] == [("a@example.com", "A", "active")]
+    assert response.next_cursor is None
+
+
+def test_list_subscribers_paginates_with_cursor():
+    db = _make_db_session()
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(3):
+        db.add(models.Subscriber(tenant_id=1, email=f"user{i}@example.com", created_at=created_at))
+    db.commit()
+
+    first = subscribers.list_subscribers(tenant_id=None, limit=2, cursor=None, db=db)
+    second = subscribers.list_subscribers(tenant_id=None, limit=2, cursor=first.next_cursor, db=db)
+
+    assert [s.email for s in first.items] == ["user2@example.com", "user1@example.com"]
+    assert [s.email for s in second.items] == ["user0@example.com"]
+    assert second.next_cursor is None
+
+
+@pytest.mark.parametrize("email", ["@", "a@", "@b.com", "a b@c.com", "a@b"])
+def test_subscriber_create_rejects_malformed_email(email):
+    with pytest.raises(ValidationError):
+        subscribers.SubscriberCreate(tenant_id=1, email=email)
+
+
+def test_subscriber_create_lowercases_email():
+    assert subscribers.SubscriberCreate(tenant_id=1, email=" Alice@Example.COM ").email == "alice@example.com"
+
+
+def test_list_subscribers_paginates_rows_from_the_same_second():
+    db = _make_db_session()
+    # created_at comes from the server default; all three rows are inserted within the same second.
+    db.add_all([models.Subscriber(tenant_id=1, email=f"user{i}@example.com") for i in range(3)])
+    db.commit()
+
+    first = subscribers.list_subscribers(tenant_id=None, limit=2, cursor=None, db=db)
+    second = subscribers.list_subscribers(tenant_id=None, limit=2, cursor=first.next_cursor, db=db)
+
+    assert [s.email for s in first.items] == ["user2@example.com", "user1@example.com"]
+    assert [s.email for s in second.items] == ["user0@example.com"]
+    assert second.next_cursor is None
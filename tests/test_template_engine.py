@@ -0,0 +1,33 @@
+"""Tests for template rendering."""
+from __future__ import annotations
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from src.services import template_engine
+
+
+def test_templates_are_compiled_once(monkeypatch, tmp_path):
+    (tmp_path / "welcome.txt").write_text("Hi {{ name }}")
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), auto_reload=template_engine._env.auto_reload)
+    monkeypatch.setattr(template_engine, "_env", env)
+
+    assert template_engine.warm_templates() == 1
+    (tmp_path / "welcome.txt").write_text("Changed {{ name }}")
+
+    assert template_engine.render_template("welcome.txt", name="Ada") == "Hi Ada"
+    assert template_engine.get_template("welcome.txt") is template_engine.get_template("welcome.txt")
+
+
+def test_bytecode_cache_uses_configured_dir(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "jinja"
+    monkeypatch.setattr(template_engine.settings, "template_cache_dir", str(cache_dir))
+
+    cache = template_engine._make_bytecode_cache()
+    assert isinstance(cache, FileSystemBytecodeCache)
+    assert cache.directory == str(cache_dir) and cache_dir.is_dir()
+
+    (tmp_path / "welcome.txt").write_text("Hi {{ name }}")
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), bytecode_cache=cache)
+    monkeypatch.setattr(template_engine, "_env", env)
+    template_engine.warm_templates()
+    assert [path.name.endswith(".cache") for path in cache_dir.iterdir()] == [True]
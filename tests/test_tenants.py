@@ -0,0 +1,46 @@
+"""Tests for the tenant routes."""
+from __future__ import annotations
+
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import campaigns, domains, tenants
+from src.db import models
+
+
+def _make_db_session():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)()
+
+
+def test_create_and_update_tenant_without_refresh():
+    db = _make_db_session()
+
+    created = tenants.create_tenant(tenants.TenantCreate(name="Acme", contact_email="ops@acme.com"), db=db)
+    updated = tenants.update_tenant(created.id, tenants.TenantUpdate(name="Acme Inc"), db=db)
+
+    assert created.id is not None
+    assert created.ses_verified is False
+    assert (updated.name, updated.contact_email) == ("Acme Inc", "ops@acme.com")
+
+
+def test_delete_tenant_invalidates_cached_domain_status_and_campaigns():
+    db = _make_db_session()
+    created = tenants.create_tenant(tenants.TenantCreate(name="Acme", contact_email="ops@acme.com"), db=db)
+    response = Response()
+    domains.get_domain_status(created.id, response, db=db)
+    campaigns.campaign_cache.set(1, object())
+    assert response.headers["cache-control"] == "private, max-age=30"
+
+    tenants.delete_tenant(created.id, db=db)
+
+    assert domains.domain_status_cache.get(created.id) is None
+    assert campaigns.campaign_cache.get(1) is None
@@ -0,0 +1,249 @@
+"""Tests for the email worker's buffered status writes."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db import models
+from src.queue import worker
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://", future=True, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def fake_session_scope():
+        session = SessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    monkeypatch.setattr(worker, "session_scope", fake_session_scope)
+    # Only explicit flushes or the size threshold write in these tests.
+    monkeypatch.setattr(worker, "LOG_FLUSH_INTERVAL_SECONDS", 60)
+    session = SessionLocal()
+    yield session
+    worker.flush_log_updates()
+    session.close()
+    engine.dispose()
+
+
+def test_status_updates_are_buffered_until_flush(db):
+    db.add_all([models.EmailLog(recipient_email=f"u{i}@example.com", status="queued") for i in range(2)])
+    db.commit()
+
+    worker._mark_log_sent(1, "ses-1")
+    worker._mark_log_failed(2, "x" * 2000)
+    worker._mark_log_sent(99, "ses-missing")
+    assert [log.status for log in db.query(models.EmailLog).order_by(models.EmailLog.id)] == ["queued", "queued"]
+
+    worker.flush_log_updates()
+    db.expire_all()
+    sent, failed = db.query(models.EmailLog).order_by(models.EmailLog.id).all()
+    assert (sent.status, sent.message_id, sent.last_event_type) == ("sent", "ses-1", "send")
+    assert (failed.status, failed.last_event_type) == ("failed", "send_failed")
+    assert sent.last_event_at is not None and sent.last_event_at == failed.last_event_at
+    assert len(failed.last_smtp_response) == 1024
+
+
+def test_flush_updates_without_selecting_logs(db):
+    db.add(models.EmailLog(recipient_email="u0@example.com", status="queued"))
+    db.commit()
+    statements = []
+    engine = db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        worker._mark_log_sent(1, "ses-1")
+        worker.flush_log_updates()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statements == ["UPDATE"]
+
+
+def test_buffer_flushes_when_full(db, monkeypatch):
+    monkeypatch.setattr(worker, "LOG_FLUSH_SIZE", 3)
+    db.add_all([models.EmailLog(recipient_email=f"u{i}@example.com", status="queued") for i in range(3)])
+    db.commit()
+
+    for log_id in (1, 2, 3):
+        worker._mark_log_sent(log_id, f"ses-{log_id}")
+
+    db.expire_all()
+    assert [log.message_id for log in db.query(models.EmailLog).order_by(models.EmailLog.id)] == [
+        "ses-1",
+        "ses-2",
+        "ses-3",
+    ]
+    assert not worker._pending_log_updates
+
+
+def test_failed_flush_keeps_updates_for_bounded_retries(db, monkeypatch):
+    db.add(models.EmailLog(recipient_email="u0@example.com", status="queued"))
+    db.commit()
+    working_scope = worker.session_scope
+
+    @contextmanager
+    def broken_session_scope():
+        raise ConnectionError("database unavailable")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(worker, "session_scope", broken_session_scope)
+    worker._mark_log_sent(1, "ses-1")
+    worker.flush_log_updates()
+    assert [attempts for _, _, attempts in worker._pending_log_updates] == [1]
+
+    monkeypatch.setattr(worker, "session_scope", working_scope)
+    worker.flush_log_updates()
+    db.expire_all()
+    assert db.query(models.EmailLog).one().status == "sent"
+
+    monkeypatch.setattr(worker, "session_scope", broken_session_scope)
+    worker._mark_log_sent(1, "ses-2")
+    for _ in range(worker.LOG_FLUSH_MAX_ATTEMPTS):
+        worker.flush_log_updates()
+    assert not worker._pending_log_updates
+
+
+def test_process_email_job_reuses_shared_ses_service(db, monkeypatch):
+    calls = []
+
+    def fake_send_email(**kwargs):
+        calls.append(kwargs["recipient"])
+        return f"ses-{len(calls)}"
+
+    monkeypatch.setattr(worker.ses_service, "send_email", fake_send_email)
+
+    assert worker.process_email_job(subject="Hi", recipient="a@example.com", body="Body") == "ses-1"
+    assert worker.process_email_job(subject="Hi", recipient="b@example.com", body="Body") == "ses-2"
+    assert calls == ["a@example.com", "b@example.com"]
+
+
+def test_job_drains_buffer_when_it_finishes_under_forking_worker(db, monkeypatch):
+    db.add_all([models.EmailLog(recipient_email=f"u{i}@example.com", status="queued") for i in range(2)])
+    db.commit()
+    monkeypatch.setattr(worker.ses_service, "send_email", lambda **kwargs: "ses-1")
+
+    worker.process_email_job(subject="Hi", recipient="u0@example.com", body="Body", email_log_id=1)
+    assert not worker._pending_log_updates
+    db.expire_all()
+    assert db.get(models.EmailLog, 1).status == "sent"
+
+    # With WORKER_IN_PROCESS the buffer outlives the job and is flushed in batches.
+    monkeypatch.setattr(worker, "_buffer_outlives_jobs", True)
+    worker.process_email_job(subject="Hi", recipient="u1@example.com", body="Body", email_log_id=2)
+    assert len(worker._pending_log_updates) == 1
+
+
+def test_enqueue_bulk_email_jobs_uses_one_pipeline(monkeypatch):
+    executed = []
+
+    class FakePipeline:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self):
+            executed.append(True)
+
+    class FakeQueue:
+        connection = type("Conn", (), {"pipeline": lambda self: FakePipeline()})()
+
+        def enqueue_many(self, job_datas, pipeline=None):
+            assert isinstance(pipeline, FakePipeline)
+            return job_datas
+
+    monkeypatch.setattr(worker, "_get_queue", lambda: FakeQueue())
+
+    job_datas = worker.enqueue_bulk_email_jobs(
+        [
+            {"campaign_id": 1, "recipients": [(1, "a@example.com")], "job_id": "job-1"},
+            {"campaign_id": 1, "content_digest": "abc", "recipients": [(2, "b@example.com")], "job_id": "job-2"},
+        ]
+    )
+
+    assert [data.job_id for data in job_datas] == ["job-1", "job-2"]
+    assert job_datas[1].kwargs == {"campaign_id": 1, "recipients": [(2, "b@example.com")], "content_digest": "abc"}
+    assert executed == [True]
+
+
+def test_process_bulk_email_job_marks_each_recipient(db, monkeypatch):
+    db.add(models.Campaign(id=7, tenant_id=1, name="Launch", subject="Hi", body="Body"))
+    db.add_all([models.EmailLog(recipient_email=f"u{i}@example.com", status="queued") for i in range(2)])
+    db.commit()
+    monkeypatch.setattr(worker, "_campaign_contents", worker.TTLCache(maxsize=8, ttl=60))
+    templates = []
+
+    def fake_ensure_template(name, **kwargs):
+        templates.append((name, kwargs["subject"]))
+
+    def fake_send_bulk_email(*, template_name, recipients):
+        assert template_name == templates[-1][0]
+        return [("ses-1", None), (None, "MessageRejected")]
+
+    monkeypatch.setattr(worker.ses_service, "ensure_template", fake_ensure_template)
+    monkeypatch.setattr(worker.ses_service, "send_bulk_email", fake_send_bulk_email)
+
+    sent = worker.process_bulk_email_job(campaign_id=7, recipients=[(1, "u0@example.com"), (2, "u1@example.com")])
+    worker.flush_log_updates()
+
+    assert sent == 1
+    assert [subject for _, subject in templates] == ["Hi"]
+    assert templates[0][0].startswith("campaign-7-")
+    db.expire_all()
+    first, second = db.query(models.EmailLog).order_by(models.EmailLog.id).all()
+    assert (first.status, first.message_id) == ("sent", "ses-1")
+    assert (second.status, second.last_smtp_response) == ("failed", "MessageRejected")
+
+    # Content is read once per (campaign, digest); an edit arrives with a new digest and is re-read.
+    digest = worker.campaign_content_digest("Hi", "Body")
+    db.query(models.Campaign).filter_by(id=7).update({"subject": "Hello"})
+    db.commit()
+    assert worker.process_bulk_email_job(campaign_id=7, recipients=[(1, "u0@example.com")], content_digest=digest) == 1
+    assert templates[-1][1] == "Hi"
+    new_digest = worker.campaign_content_digest("Hello", "Body")
+    worker.process_bulk_email_job(campaign_id=7, recipients=[(1, "u0@example.com")], content_digest=new_digest)
+    assert templates[-1][1] == "Hello"
+
+
+def test_process_bulk_email_job_sends_chunks_concurrently(db, monkeypatch):
+    db.add(models.Campaign(id=8, tenant_id=1, name="Launch", subject="Hi", body="Body"))
+    db.add_all([models.EmailLog(recipient_email=f"u{i}@example.com", status="queued") for i in range(5)])
+    db.commit()
+    monkeypatch.setattr(worker, "_campaign_contents", worker.TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(worker, "BULK_DESTINATIONS_MAX", 2)
+    monkeypatch.setattr(worker.ses_service, "ensure_template", lambda name, **kwargs: None)
+    calls = []
+
+    def fake_send_bulk_email(*, template_name, recipients):
+        calls.append(list(recipients))
+        if "u2@example.com" in recipients:
+            raise RuntimeError("SES send_bulk_templated_email failed")
+        return [(f"ses-{email}", None) for email in recipients]
+
+    monkeypatch.setattr(worker.ses_service, "send_bulk_email", fake_send_bulk_email)
+
+    with pytest.raises(RuntimeError):
+        worker.process_bulk_email_job(
+            campaign_id=8, recipients=[(i + 1, f"u{i}@example.com") for i in range(5)]
+        )
+    worker.flush_log_updates()
+
+    assert sorted(len(chunk) for chunk in calls) == [1, 2, 2]
+    db.expire_all()
+    statuses = [log.status for log in db.query(models.EmailLog).order_by(models.EmailLog.id)]
+    assert statuses == ["sent", "sent", "failed", "failed", "sent"]